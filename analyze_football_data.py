@@ -1,6 +1,17 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
 
+import compaction
+import elo
+import head_to_head
+import incremental
+import rolling_engine
+import sinks
+from instrumentation import Metrics, NO_METRICS
+
 def calculate_team_stats(df, team, n_matches):
     """Calculate statistics for a team over their last N matches."""
     team_matches = df[
@@ -98,8 +109,20 @@ def calculate_team_stats(df, team, n_matches):
     
     return stats
 
-def process_all_teams(df):
-    """Process all teams and calculate their statistics."""
+def calculate_team_window_stats(df, team, windows=[5, 15, 38], metrics=NO_METRICS):
+    """Calculate a team's statistics for every window size."""
+    window_stats = {}
+    for n in windows:
+        with metrics.stage('team_window', team=team, window=n):
+            window_stats[n] = calculate_team_stats(df, team, n)
+    return window_stats
+
+def process_all_teams(df, windows=[5, 15, 38], workers=None, metrics=NO_METRICS):
+    """Process all teams and calculate their statistics.
+
+    With `workers` > 1 teams are processed in a process pool, each worker
+    receiving only the matches of its team.
+    """
     processed_df = df.copy()
     
     # Get unique teams
@@ -107,57 +130,188 @@ def process_all_teams(df):
     
     # Calculate statistics for each team
     team_stats = {}
-    for team in all_teams:
-        print(f'Processing {team}...')
-        team_stats[team] = {
-            5: calculate_team_stats(df, team, 5),
-            15: calculate_team_stats(df, team, 15),
-            38: calculate_team_stats(df, team, 38)
-        }
-    
-    # Add statistics to the dataframe
-    for idx, row in processed_df.iterrows():
-        home_team = row['HomeTeam']
-        away_team = row['AwayTeam']
-        
-        # Add home team stats
-        for n in [5, 15, 38]:
-            for stat_name, stat_values in team_stats[home_team][n].items():
-                col_name = f'Home_{stat_name}'
-                if idx in stat_values:
-                    processed_df.at[idx, col_name] = stat_values[idx]
-        
-        # Add away team stats
-        for n in [5, 15, 38]:
-            for stat_name, stat_values in team_stats[away_team][n].items():
-                col_name = f'Away_{stat_name}'
-                if idx in stat_values:
-                    processed_df.at[idx, col_name] = stat_values[idx]
+    if workers and workers > 1:
+        with metrics.stage('teams_parallel', workers=workers), \
+                ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                team: pool.submit(
+                    calculate_team_window_stats,
+                    df[(df['HomeTeam'] == team) | (df['AwayTeam'] == team)],
+                    team,
+                    windows
+                )
+                for team in all_teams
+            }
+            for team, future in futures.items():
+                team_stats[team] = future.result()
+    else:
+        for team in all_teams:
+            with metrics.stage('team', team=team):
+                team_stats[team] = calculate_team_window_stats(df, team, windows, metrics)
     
-    return processed_df
+    with metrics.stage('merge'):
+        return attach_team_stats(processed_df, team_stats, windows)
+
+def attach_team_stats(df, team_stats, windows):
+    """Attach per-team statistics to the matches as Home_*/Away_* columns.
+
+    All feature blocks are built as whole columns and joined onto the
+    match frame in a single concat.
+    """
+    home_blocks = []
+    away_blocks = []
+    for team, stats_by_window in team_stats.items():
+        team_frame = pd.concat(
+            [pd.DataFrame(stats_by_window[n]) for n in windows], axis=1
+        ).astype(np.float64)
+        home_blocks.append(team_frame.reindex(df.index[df['HomeTeam'] == team]))
+        away_blocks.append(team_frame.reindex(df.index[df['AwayTeam'] == team]))
+
+    home = pd.concat(home_blocks).reindex(df.index).add_prefix('Home_')
+    away = pd.concat(away_blocks).reindex(df.index).add_prefix('Away_')
+    return rolling_engine.attach_side_features(df, home, away)
+
+# Available engines for computing the rolling team statistics
+ENGINES = {
+    'loop': process_all_teams,
+    'vectorized': rolling_engine.process_all_teams,
+}
 
-def main():
+# Optional match-level feature sources: name -> function(matches) returning columns aligned with them
+FEATURE_SOURCES = {
+    'h2h': head_to_head.calculate_h2h_features,
+    'elo': elo.calculate_elo_features,
+}
+
+# Sources that continue from saved state: name -> function(state, new matches)
+STATEFUL_SOURCES = {
+    'h2h': head_to_head.update_h2h,
+    'elo': elo.update_ratings,
+}
+
+def add_feature_sources(rows, df_raw, sources, state=None, metrics=NO_METRICS):
+    """Attach the named feature sources to `rows`, a subset of the matches in df_raw.
+
+    Stateful sources continue from their entry in the incremental `state`
+    over just the rows' matches; the others are computed over all matches.
+    Earlier matches a stateful source has not seen yet, e.g. because the
+    state was saved before the source was enabled, are replayed first.
+    """
+    for name in sources:
+        with metrics.stage('features', source=name):
+            if name in STATEFUL_SOURCES and state is not None:
+                source_state = state.setdefault('sources', {}).setdefault(name, {})
+                ids = df_raw['Incremental_ID']
+                missed = df_raw[(ids > source_state.get('last_id', 0)) & ~df_raw.index.isin(rows.index)]
+                if len(missed):
+                    print(f'Replaying {len(missed)} earlier matches for {name}...')
+                    STATEFUL_SOURCES[name](source_state, missed)
+                features = STATEFUL_SOURCES[name](source_state, df_raw.loc[rows.index])
+                if len(df_raw):
+                    source_state['last_id'] = int(ids.max())
+            else:
+                features = FEATURE_SOURCES[name](df_raw)
+        rows = pd.concat(
+            [rows.drop(columns=features.columns, errors='ignore'), features.loc[rows.index]],
+            axis=1
+        )
+    return rows
+
+def main(input_file='Football Data Test Task.xlsx', engine='vectorized', windows=rolling_engine.WINDOWS,
+         state_file=None,
+         workers=None, compact=False, sink='workbook', output_file=None, features=(),
+         half_lives=(), metrics_file=None, trace_memory=False, profile_file=None):
+    """Process the workbook, optionally appending only new matches.
+
+    When `state_file` points to an existing rolling state, only matches
+    added since the last run are processed and appended to the output.
+    Results go to the named sink (see sinks.SINKS); the default 'workbook'
+    sink replaces the 'Processed Data' sheet of the input workbook.
+    `features` names extra sources from FEATURE_SOURCES, e.g. ('h2h', 'elo'),
+    and `half_lives` adds exponentially weighted *_EW<h> features (vectorized
+    engine only).
+    Stage timings are written as JSON lines to `metrics_file`, with peak
+    memory if `trace_memory` is set and a cProfile dump to `profile_file`.
+    """
+    if half_lives and engine != 'vectorized':
+        raise ValueError('Exponentially weighted features need the vectorized engine')
+    output_file = output_file or sinks.default_output(input_file, sink)
+    metrics = Metrics(metrics_file, trace_memory, profile_file)
+    try:
+        run(metrics, input_file, engine, state_file, workers, compact, sink, output_file,
+            features, half_lives, windows)
+    finally:
+        metrics.close()
+
+def run(metrics, input_file, engine, state_file, workers, compact, sink, output_file,
+        features=(), half_lives=(), windows=rolling_engine.WINDOWS):
     # Read the Excel file
     print('Reading data...')
-    df_raw = pd.read_excel('Football Data Test Task.xlsx', sheet_name='Raw Data')
+    with metrics.stage('read'):
+        df_raw = pd.read_excel(input_file, sheet_name='Raw Data')
     print(f'Raw data shape: {df_raw.shape}')
     
-    # Process all teams
-    print('\nProcessing teams...')
-    processed_df = process_all_teams(df_raw)
+    state = None
+    if state_file and os.path.exists(state_file):
+        state = incremental.load_state(state_file)
+        if list(half_lives) != state.get('half_lives', []):
+            raise ValueError(
+                f'State {state_file} was built with half-lives {state.get("half_lives", [])}, '
+                f'not {list(half_lives)}; delete it to rebuild'
+            )
+        if not incremental.history_unchanged(df_raw, state):
+            print('\nMatches already processed were edited or removed, rebuilding the state...')
+            os.remove(state_file)
+            state = None
+    incremental_run = state is not None
+
+    if incremental_run:
+        # Incremental update from the saved per-team state
+        new_matches = incremental.new_matches_since(df_raw, state)
+        print(f'\nProcessing {len(new_matches)} new matches incrementally...')
+        with metrics.stage('incremental', matches=len(new_matches)):
+            new_rows = incremental.update_state(state, new_matches, windows)
+        new_rows = add_feature_sources(new_rows, df_raw, features, state, metrics)
+        if sink in sinks.UPSERTS:
+            # Only the new rows are written
+            processed_df = new_rows
+        else:
+            with metrics.stage('read_processed'):
+                existing = sinks.read_output(sink, output_file)
+            processed_df = pd.concat([existing, new_rows], ignore_index=True)
+    else:
+        # Process all teams
+        print(f'\nProcessing teams ({engine} engine)...')
+        with metrics.stage('process', engine=engine, matches=len(df_raw)):
+            options = {'half_lives': half_lives} if half_lives else {}
+            processed_df = ENGINES[engine](df_raw, windows, workers=workers, metrics=metrics, **options)
+        if state_file:
+            state = incremental.build_state(df_raw, max(windows), half_lives)
+        processed_df = add_feature_sources(processed_df, df_raw, features, state, metrics)
+    
+    if compact:
+        print('\nCompacting dtypes...')
+        with metrics.stage('compact'):
+            processed_df = compaction.compact_frame(processed_df, report=True)
+    
+    # Save results
+    print(f'\nSaving results ({sink} sink)...')
+    with metrics.stage('write', sink=sink, rows=len(processed_df), columns=len(processed_df.columns)):
+        if incremental_run and sink in sinks.UPSERTS and os.path.exists(output_file):
+            sinks.upsert_output(processed_df, sink, output_file)
+        else:
+            sinks.write_output(processed_df, sink, output_file)
     
-    # Save to Excel
-    print('\nSaving results...')
-    with pd.ExcelWriter('Football Data Test Task.xlsx', mode='a', 
-                       if_sheet_exists='replace', engine='openpyxl') as writer:
-        processed_df.to_excel(writer, sheet_name='Processed Data', index=False)
+    if state is not None:
+        state['history'] = incremental.history_digest(df_raw, state['last_id'])
+        incremental.save_state(state, state_file)
     
     # Print new columns
     print('\nNew columns added:')
     new_cols = [col for col in processed_df.columns if col not in df_raw.columns]
     print('\n'.join(new_cols))
     
-    print('\nDone! Check the "Processed Data" sheet in the Excel file.')
+    print(f'\nDone! Results written to {output_file}.')
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,99 @@
+import argparse
+import hashlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import analyze_football_data
+import sinks
+from ingest_csv import expand_paths
+from rolling_engine import WINDOWS
+
+def process_file(input_file, options):
+    """Process one workbook; returns its timing and any error instead of raising."""
+    start = time.perf_counter()
+    try:
+        analyze_football_data.main(input_file, **options)
+        error = None
+    except Exception as exc:
+        error = f'{type(exc).__name__}: {exc}'
+    return {
+        'file': input_file,
+        'seconds': round(time.perf_counter() - start, 3),
+        'error': error,
+    }
+
+def state_path(state_dir, input_file):
+    """Per-workbook incremental state file inside state_dir.
+
+    The name carries a hash of the workbook's absolute path, so workbooks
+    with the same name in different directories keep separate states.
+    """
+    name = os.path.splitext(os.path.basename(input_file))[0]
+    digest = hashlib.sha1(os.path.abspath(input_file).encode()).hexdigest()[:12]
+    return os.path.join(state_dir, f'{name}-{digest}.state.json')
+
+def run_batch(paths, options, workers=None, state_dir=None):
+    """Process the workbooks in a process pool and return one result per file.
+
+    Each worker imports pandas once and processes many workbooks, instead of
+    one interpreter being launched per file.
+    """
+    if state_dir:
+        os.makedirs(state_dir, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                process_file,
+                path,
+                {**options, 'state_file': state_path(state_dir, path) if state_dir else None}
+            )
+            for path in paths
+        ]
+        results = [future.result() for future in as_completed(futures)]
+    order = {path: position for position, path in enumerate(paths)}
+    return sorted(results, key=lambda result: order[result['file']])
+
+def print_summary(results):
+    width = max([len('File')] + [len(result['file']) for result in results])
+    print(f'\n{"File":<{width}}  {"Seconds":>8}  Status')
+    for result in results:
+        status = 'ok' if result['error'] is None else f'FAILED {result["error"]}'
+        print(f'{result["file"]:<{width}}  {result["seconds"]:>8.2f}  {status}')
+    failed = sum(result['error'] is not None for result in results)
+    total = sum(result['seconds'] for result in results)
+    print(f'\n{len(results) - failed} processed, {failed} failed, {total:.2f}s of processing')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Process many football data workbooks concurrently.')
+    parser.add_argument('inputs', nargs='+', help='workbook paths or glob patterns')
+    parser.add_argument('--windows', nargs='+', type=int, default=WINDOWS)
+    parser.add_argument('--engine', choices=list(analyze_football_data.ENGINES), default='vectorized')
+    parser.add_argument('--sink', choices=list(sinks.SINKS), default='workbook')
+    parser.add_argument('--features', nargs='+', choices=list(analyze_football_data.FEATURE_SOURCES),
+                        default=[])
+    parser.add_argument('--half-lives', nargs='+', type=float, default=[])
+    parser.add_argument('--workers', type=int, default=None,
+                        help='worker processes (default: one per CPU)')
+    parser.add_argument('--state-dir', default=None,
+                        help='keep incremental state per workbook in this directory')
+    parser.add_argument('--compact', action='store_true', help='write compact dtypes')
+    args = parser.parse_args(argv)
+
+    paths = expand_paths(args.inputs)
+    options = {
+        'engine': args.engine,
+        'windows': args.windows,
+        'sink': args.sink,
+        'features': tuple(args.features),
+        'half_lives': tuple(int(h) if h.is_integer() else h for h in args.half_lives),
+        'compact': args.compact,
+    }
+    print(f'Processing {len(paths)} workbooks...')
+    results = run_batch(paths, options, args.workers, args.state_dir)
+    print_summary(results)
+    return 1 if any(result['error'] for result in results) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+import analyze_football_data
+import process_football_data
+import rolling_engine
+import synthetic_league
+
+# Data sizes as (teams, seasons, divisions)
+DEFAULT_SIZES = [(6, 1, 1), (20, 1, 1), (20, 5, 1), (20, 10, 4)]
+
+# Set to False to skip the traced memory pass of every stage
+TRACE_MEMORY = True
+# Stages slower than this many seconds skip the traced pass (their peak is reported as 0)
+TRACE_MAX_SECONDS = 10
+
+def run_stage(results, name, func, *args):
+    """Run one pipeline stage, recording wall time and peak traced memory.
+
+    tracemalloc slows pandas code down several times, so the stage is timed
+    untraced and then run again under tracemalloc to measure its peak.
+    """
+    start = time.perf_counter()
+    value = func(*args)
+    seconds = time.perf_counter() - start
+
+    peak = 0
+    if TRACE_MEMORY and seconds <= TRACE_MAX_SECONDS:
+        tracemalloc.start()
+        func(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    results.append({'stage': name, 'seconds': seconds, 'peak_mb': peak / 1e6})
+    return value
+
+def read_raw(workbook):
+    return pd.read_excel(workbook, sheet_name='Raw Data')
+
+def write_processed(workbook, df):
+    with pd.ExcelWriter(workbook, mode='a', if_sheet_exists='replace', engine='openpyxl') as writer:
+        df.to_excel(writer, sheet_name='Processed Data', index=False)
+
+def bench_process_football_data(workbook, results):
+    df = run_stage(results, 'read', read_raw, workbook)
+    home_stats, away_stats = run_stage(
+        results, 'rolling',
+        lambda: (process_football_data.calculate_rolling_stats(df, 'HomeTeam'),
+                 process_football_data.calculate_rolling_stats(df, 'AwayTeam'))
+    )
+    df = run_stage(results, 'merge', process_football_data.attach_rolling_stats, df, home_stats, away_stats)
+    run_stage(results, 'write', write_processed, workbook, df)
+
+def bench_analyze_loop(workbook, results):
+    df = run_stage(results, 'read', read_raw, workbook)
+    all_teams = pd.concat([df['HomeTeam'], df['AwayTeam']]).unique()
+    team_stats = run_stage(
+        results, 'rolling',
+        lambda: {team: analyze_football_data.calculate_team_window_stats(df, team) for team in all_teams}
+    )
+    df = run_stage(results, 'merge', analyze_football_data.attach_team_stats, df, team_stats, [5, 15, 38])
+    run_stage(results, 'write', write_processed, workbook, df)
+
+def _vectorized_rolling(df):
+    team_matches = rolling_engine.build_team_matches(df)
+    return team_matches, rolling_engine.calculate_team_features(team_matches)
+
+def bench_analyze_vectorized(workbook, results):
+    df = run_stage(results, 'read', read_raw, workbook)
+    team_matches, features = run_stage(results, 'rolling', _vectorized_rolling, df)
+    df = run_stage(results, 'merge', rolling_engine.attach_team_features, df, team_matches, features)
+    run_stage(results, 'write', write_processed, workbook, df)
+
+# Pipeline name -> (benchmark function, time budget in seconds or None)
+# Sizes whose estimated run time exceeds the budget are skipped
+PIPELINES = {
+    'process_football_data': (bench_process_football_data, None),
+    'analyze_loop': (bench_analyze_loop, 60),
+    'analyze_vectorized': (bench_analyze_vectorized, None),
+}
+
+def run_benchmarks(sizes=DEFAULT_SIZES, pipelines=list(PIPELINES), seed=0):
+    """Time every pipeline stage on synthetic leagues of the given sizes.
+
+    Sizes are run from the smallest up. A pipeline with a time budget skips
+    a size when its previous run, scaled quadratically with the match count
+    (a conservative bound for the per-team loop), is estimated to exceed the
+    budget. Returns the stage records and the skipped (pipeline, size) runs.
+    """
+    records = []
+    skipped = []
+    last_run = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for teams, seasons, divisions in sorted(sizes, key=lambda size: size[0] ** 2 * size[1] * size[2]):
+            df = synthetic_league.generate_league(teams, seasons, divisions, seed=seed)
+            workbook = os.path.join(tmp, f'league_{teams}x{seasons}x{divisions}.xlsx')
+            synthetic_league.write_workbook(df, workbook)
+
+            for name in pipelines:
+                bench, budget = PIPELINES[name]
+                if budget is not None and name in last_run:
+                    matches, seconds = last_run[name]
+                    estimate = seconds * (len(df) / matches) ** 2
+                    if estimate > budget:
+                        reason = (f'estimated {estimate:,.0f}s from {matches:,} matches in {seconds:.1f}s, '
+                                  f'over the {budget}s budget')
+                        print(f'{name}: skipping {teams}x{seasons}x{divisions} ({len(df):,} matches), {reason}')
+                        skipped.append({
+                            'pipeline': name, 'teams': teams, 'seasons': seasons,
+                            'divisions': divisions, 'matches': len(df), 'reason': reason,
+                        })
+                        continue
+                print(f'{name}: {teams} teams x {seasons} seasons x {divisions} divisions '
+                      f'({len(df):,} matches)')
+                stage_results = []
+                bench(workbook, stage_results)
+                for result in stage_results:
+                    result.update({
+                        'pipeline': name, 'teams': teams, 'seasons': seasons,
+                        'divisions': divisions, 'matches': len(df),
+                    })
+                    print(f"  {result['stage']:<8} {result['seconds']:>9.3f}s "
+                          f"{result['peak_mb']:>9.1f} MB")
+                records.extend(stage_results)
+                last_run[name] = (len(df), sum(result['seconds'] for result in stage_results))
+    return records, skipped
+
+def _key(record):
+    return (record['pipeline'], record['teams'], record['seasons'],
+            record['divisions'], record['stage'])
+
+def find_regressions(records, baseline, tolerance=0.25):
+    """Return the records slower or hungrier than the baseline by more than tolerance."""
+    previous = {_key(record): record for record in baseline}
+    regressions = []
+    for record in records:
+        old = previous.get(_key(record))
+        if old is None:
+            continue
+        for metric in ['seconds', 'peak_mb']:
+            if old[metric] > 0 and record[metric] > 0 and record[metric] > old[metric] * (1 + tolerance):
+                regressions.append({**record, 'metric': metric, 'baseline': old[metric]})
+    return regressions
+
+def parse_size(text):
+    teams, seasons, divisions = (int(part) for part in text.split('x'))
+    return teams, seasons, divisions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the football data processors.')
+    parser.add_argument('--sizes', nargs='+', type=parse_size,
+                        default=DEFAULT_SIZES, help='TEAMSxSEASONSxDIVISIONS, e.g. 20x5x1')
+    parser.add_argument('--pipelines', nargs='+', choices=list(PIPELINES), default=list(PIPELINES))
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', default='benchmark_baseline.json')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='store these results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--no-memory', action='store_true',
+                        help='skip the traced peak memory measurement')
+    args = parser.parse_args(argv)
+
+    global TRACE_MEMORY
+    TRACE_MEMORY = not args.no_memory
+
+    records, skipped = run_benchmarks(args.sizes, args.pipelines)
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'results': records,
+        'skipped': skipped,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f'\nResults written to {args.output}')
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f'Baseline saved to {args.baseline}')
+        return 0
+
+    if not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)['results']
+    regressions = find_regressions(records, baseline, args.tolerance)
+    for r in regressions:
+        print(f"REGRESSION {r['pipeline']} {r['teams']}x{r['seasons']}x{r['divisions']} "
+              f"{r['stage']} {r['metric']}: {r[r['metric']]:.3f} vs baseline {r['baseline']:.3f}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+import numpy as np
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+# Line/scatter traces longer than this are drawn with WebGL
+WEBGL_THRESHOLD = 1000
+# Line/scatter traces longer than this are downsampled with LTTB
+MAX_LINE_POINTS = 2000
+
+def _clean(values):
+    values = np.asarray(values, dtype=np.float64)
+    return values[~np.isnan(values)]
+
+def histogram_bins(values, bins='auto'):
+    """Counts and edges of a histogram computed server-side."""
+    values = _clean(values)
+    if not len(values):
+        return np.array([]), np.array([0.0, 1.0])
+    # Integer-valued data (goals, cards) gets one bin per value
+    if bins == 'auto' and np.array_equal(values, np.round(values)) and np.ptp(values) <= 100:
+        bins = np.arange(values.min() - 0.5, values.max() + 1.5)
+    return np.histogram(values, bins=bins)
+
+def histogram_trace(values, name=None, bins='auto', **kwargs):
+    """A bar trace of pre-binned counts, replacing go.Histogram on raw rows."""
+    return binned_trace(histogram_bins(values, bins), name, **kwargs)
+
+def binned_trace(binned, name=None, **kwargs):
+    """A bar trace of (counts, edges) from histogram_bins."""
+    counts, edges = binned
+    return go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        name=name,
+        **kwargs
+    )
+
+def box_stats(values):
+    """Quartiles, whisker fences and mean of the values (Tukey 1.5 IQR fences)."""
+    values = _clean(values)
+    if not len(values):
+        return None
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    return {
+        'q1': q1, 'median': median, 'q3': q3,
+        'lowerfence': inside.min(), 'upperfence': inside.max(),
+        'mean': values.mean(),
+    }
+
+def box_trace(values, name=None, horizontal=False, **kwargs):
+    """A box trace built from precomputed statistics instead of every row."""
+    return stats_box_trace(box_stats(values), name, horizontal, **kwargs)
+
+def stats_box_trace(stats, name=None, horizontal=False, **kwargs):
+    """A box trace of statistics from box_stats."""
+    stats = stats or dict.fromkeys(['q1', 'median', 'q3', 'lowerfence', 'upperfence', 'mean'], np.nan)
+    position = {'y': [name]} if horizontal else {'x': [name]}
+    return go.Box(
+        **{key: [value] for key, value in stats.items()},
+        **position,
+        name=name,
+        orientation='h' if horizontal else 'v',
+        **kwargs
+    )
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets downsampling of a series to n_out points."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    selected = np.empty(n_out, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+    prev = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs(
+            (x[prev] - avg_x) * (y[start:end] - y[prev])
+            - (x[prev] - x[start:end]) * (avg_y - y[prev])
+        )
+        prev = start + int(np.nanargmax(area)) if np.isfinite(area).any() else start
+        selected[i + 1] = prev
+    return selected
+
+def line_trace(y, x=None, name=None, max_points=MAX_LINE_POINTS,
+               webgl_threshold=WEBGL_THRESHOLD, **kwargs):
+    """A line trace, downsampled with LTTB and drawn with WebGL when long."""
+    y = np.asarray(y, dtype=np.float64)
+    x = np.arange(len(y)) if x is None else np.asarray(x)
+    if len(y) > max_points:
+        numeric_x = x if np.issubdtype(x.dtype, np.number) else np.arange(len(x))
+        keep = lttb(numeric_x, np.nan_to_num(y), max_points)
+        x, y = x[keep], y[keep]
+    trace = go.Scattergl if len(y) > webgl_threshold else go.Scatter
+    return trace(x=x, y=y, name=name, **kwargs)
+
+def histogram_with_box(values, title=None, label=None):
+    """Pre-binned replacement for px.histogram(..., marginal='box')."""
+    return binned_histogram_with_box(histogram_bins(values), box_stats(values), title, label)
+
+def binned_histogram_with_box(binned, stats, title=None, label=None):
+    """histogram_with_box from histogram_bins and box_stats results."""
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True,
+                        row_heights=[0.2, 0.8], vertical_spacing=0.02)
+    fig.add_trace(stats_box_trace(stats, name=label, horizontal=True, showlegend=False), row=1, col=1)
+    fig.add_trace(binned_trace(binned, name=label, showlegend=False), row=2, col=1)
+    fig.update_yaxes(showticklabels=False, row=1, col=1)
+    fig.update_xaxes(title_text=label, row=2, col=1)
+    fig.update_yaxes(title_text='count', row=2, col=1)
+    fig.update_layout(title=title, bargap=0)
+    return fig
+
+def payload_bytes(fig):
+    """Size of the JSON sent to the browser for a figure."""
+    return len(fig.to_json())
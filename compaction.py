@@ -0,0 +1,69 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Low-cardinality text columns stored as categoricals
+CATEGORY_COLUMNS = ['Div', 'HomeTeam', 'AwayTeam', 'FTR', 'HTR']
+
+# Rolling stats that are percentages rather than counts
+PERCENT_STATS = ['ShotConversion', 'ShotAccuracy', 'Form']
+
+FEATURE_PATTERN = re.compile(r'_L\d+$')
+
+def column_groups(df):
+    """Group the columns of a match/feature frame by how they are compacted."""
+    groups = {'categorical': [], 'count': [], 'percentage': [], 'other': []}
+    for col in df.columns:
+        if col in CATEGORY_COLUMNS:
+            groups['categorical'].append(col)
+        elif not pd.api.types.is_numeric_dtype(df[col]) or pd.api.types.is_bool_dtype(df[col]):
+            groups['other'].append(col)
+        elif FEATURE_PATTERN.search(col) and any(stat in col for stat in PERCENT_STATS):
+            groups['percentage'].append(col)
+        else:
+            groups['count'].append(col)
+    return groups
+
+def _compact_count(series):
+    """Downcast an integer-valued column to the smallest integer type."""
+    values = series.to_numpy()
+    if series.isna().any() or not np.array_equal(values, np.round(values)):
+        return series.astype(np.float32)
+    return pd.to_numeric(series.astype(np.int64), downcast='integer')
+
+def compact_frame(df, report=False):
+    """Return a copy of df with compact dtypes.
+
+    Teams, results and divisions become categoricals, integer-valued counts
+    the smallest integer type (float32 if they contain gaps) and percentages
+    float32.
+    """
+    groups = column_groups(df)
+    compacted = {}
+    for col in groups['categorical']:
+        compacted[col] = df[col].astype('category')
+    for col in groups['count']:
+        compacted[col] = _compact_count(df[col])
+    for col in groups['percentage']:
+        compacted[col] = df[col].astype(np.float32)
+
+    result = df.assign(**compacted) if compacted else df.copy()
+    if report:
+        print_memory_report(df, result, groups)
+    return result
+
+def print_memory_report(before, after, groups=None):
+    """Print memory usage per column group before and after compaction."""
+    groups = groups or column_groups(before)
+    before_usage = before.memory_usage(index=False, deep=True)
+    after_usage = after.memory_usage(index=False, deep=True)
+
+    print(f"{'Group':<12} {'Columns':>8} {'Before MB':>10} {'After MB':>10} {'Saved':>7}")
+    for name, cols in list(groups.items()) + [('total', list(before.columns))]:
+        if not cols:
+            continue
+        old = before_usage[cols].sum() / 1e6
+        new = after_usage[cols].sum() / 1e6
+        saved = (1 - new / old) * 100 if old else 0
+        print(f"{name:<12} {len(cols):>8} {old:>10.2f} {new:>10.2f} {saved:>6.1f}%")
@@ -1,8 +1,14 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import numpy as np
+import os
+
+import chart_data
+import compaction
+import dashboard_snapshot
+import rolling_engine
+import sheet_cache
+import team_index
 
 # Set page config
 st.set_page_config(
@@ -49,23 +55,145 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Load data
+EXCEL_FILE = "Football Data Test Task.xlsx"
+WINDOWS = dashboard_snapshot.WINDOWS
+COMPARISON_STATS = dashboard_snapshot.COMPARISON_STATS
+TEAM_ANALYSIS_COLUMNS = dashboard_snapshot.TEAM_ANALYSIS_COLUMNS
+PAGE_DATA = dashboard_snapshot.PAGE_DATA
+
+# Set DASHBOARD_SNAPSHOT to a bundle from dashboard_snapshot.py to serve it instead of the workbook
+SNAPSHOT_FILE = os.environ.get("DASHBOARD_SNAPSHOT")
+# Set DASHBOARD_WATCH=1 to reprocess the workbook in the background whenever it changes
+# and serve the resulting snapshot (written to DASHBOARD_SNAPSHOT if set)
+WATCH = os.environ.get("DASHBOARD_WATCH") == "1"
+# Seconds a session waits for the watcher's first bundle before showing its status
+WATCH_TIMEOUT = 60
+# Page aggregates kept across reruns, one per page and workbook version
+MAX_CACHED_AGGREGATES = 16
+
+@st.cache_resource
+def load_snapshot():
+    """The snapshot bundle, loaded once and shared by every session."""
+    return dashboard_snapshot.load_snapshot(SNAPSHOT_FILE)
+
+@st.cache_resource
+def start_watcher():
+    """The background watcher, started once and shared by every session."""
+    # Imported here so the other modes never load the processing pipeline
+    import data_watcher
+    return data_watcher.DataWatcher(
+        EXCEL_FILE, SNAPSHOT_FILE or dashboard_snapshot.SNAPSHOT_FILE
+    ).start()
+
+# The bundle served for this run; the watcher may swap in a newer one for later runs
+if WATCH:
+    watcher = start_watcher()
+    SNAPSHOT = watcher.current(WATCH_TIMEOUT)
+    if SNAPSHOT is None:
+        if watcher.error:
+            st.error(f"Could not build the dashboard data from {EXCEL_FILE}: {watcher.error}")
+        else:
+            st.info(f"Still processing {EXCEL_FILE}; reload the page in a moment.")
+        st.stop()
+    if watcher.error:
+        st.sidebar.warning(f"Showing data from before the latest change; refreshing failed: {watcher.error}")
+elif SNAPSHOT_FILE:
+    SNAPSHOT = load_snapshot()
+else:
+    SNAPSHOT = None
+
+def data_version():
+    """Key of the data being served, so cached results follow changes to it."""
+    if SNAPSHOT is not None:
+        return SNAPSHOT['fingerprint']
+    return sheet_cache.workbook_fingerprint(EXCEL_FILE)
+
+@st.cache_data
+def load_sheet(sheet_name, columns=None, version=None):
+    """Load one sheet, projected onto the given columns, with compact dtypes."""
+    df = sheet_cache.read_sheet(EXCEL_FILE, sheet_name, list(columns) if columns else None)
+    return compaction.compact_frame(df, report=True)
+
 @st.cache_data
-def load_data():
-    excel_file = "Football Data Test Task.xlsx"
-    raw_data = pd.read_excel(excel_file, sheet_name="Raw Data")
-    processed_data = pd.read_excel(excel_file, sheet_name="Processed Data")
-    manipulated_data = pd.read_excel(excel_file, sheet_name="Manipulated Data")
-    return raw_data, processed_data, manipulated_data
+def load_sheet_summary(sheet_name, version=None):
+    """Shape and data quality figures of a sheet, without keeping the sheet cached."""
+    return dashboard_snapshot.sheet_summary(sheet_cache.read_sheet(EXCEL_FILE, sheet_name))
 
-raw_data, processed_data, manipulated_data = load_data()
+def sheet_summary(sheet_name):
+    if SNAPSHOT is not None:
+        return SNAPSHOT['summaries'][sheet_name]
+    return load_sheet_summary(sheet_name, data_version())
+
+# Set DASHBOARD_DEBUG=1 to report the chart payload sent to the browser
+DEBUG = os.environ.get("DASHBOARD_DEBUG") == "1"
+chart_payloads = []
+
+def show_chart(fig):
+    """Render a plotly figure, recording its JSON size in debug mode."""
+    if DEBUG:
+        chart_payloads.append(chart_data.payload_bytes(fig))
+    st.plotly_chart(fig)
+
+def sheet_fingerprint(sheet_name):
+    """Fingerprint of a sheet's current contents, for the page aggregates cache."""
+    return f"{data_version()}:{sheet_name}"
+
+def load_page_data(page):
+    """Load the sheets a page declares in PAGE_DATA on first use."""
+    if SNAPSHOT is not None:
+        return SNAPSHOT['pages'][page]
+    return {
+        sheet: load_sheet(sheet, tuple(columns) if columns else None, data_version())
+        for sheet, columns in PAGE_DATA[page].items()
+    }
+
+@st.cache_data(max_entries=MAX_CACHED_AGGREGATES)
+def load_page_aggregates(page, fingerprints):
+    """Aggregates of a page in dashboard_snapshot.PAGE_AGGREGATES, computed from the workbook.
+
+    Cached on the page and the fingerprints of its sheets, so the pure
+    dashboard_analytics functions only run again when the data changes.
+    """
+    return dashboard_snapshot.PAGE_AGGREGATES[page](load_page_data(page))
+
+def page_aggregates(page):
+    if SNAPSHOT is not None:
+        return SNAPSHOT['aggregates'][page]
+    fingerprints = tuple((sheet, sheet_fingerprint(sheet)) for sheet in PAGE_DATA[page])
+    return load_page_aggregates(page, fingerprints)
+
+@st.cache_data
+def load_prefix_sums(version):
+    """Team-match rows and their per-team prefix sums, built once from the raw matches."""
+    raw_data = load_page_data("Team Analysis")["Raw Data"]
+    team_matches = rolling_engine.build_team_matches(raw_data)
+    return team_matches, rolling_engine.prefix_sums(team_matches)
+
+@st.cache_data
+def load_window_stats(window, version):
+    """Home_*/Away_* stats for any window and their per-team index, from the prefix sums."""
+    raw_data = load_page_data("Team Analysis")["Raw Data"]
+    team_matches, prefix = load_prefix_sums(version)
+    features = rolling_engine.calculate_team_features(team_matches, [window], prefix=prefix)
+    window_stats = rolling_engine.attach_team_features(
+        raw_data[['HomeTeam', 'AwayTeam']], team_matches, features
+    )
+    return window_stats, team_index.build_team_index(window_stats, [window])
 
 # Sidebar
 st.sidebar.header("Navigation")
 page = st.sidebar.radio(
     "Select a page",
-    ["Project Info", "Team Analysis", "Data Comparison", "Task Verification", "Detailed Analysis"]
+    list(PAGE_DATA)
 )
 
+if page in dashboard_snapshot.PAGE_AGGREGATES:
+    aggregates = page_aggregates(page)
+else:
+    page_data = load_page_data(page)
+    raw_data = page_data.get("Raw Data")
+    processed_data = page_data.get("Processed Data")
+
 if page == "Project Info":
     st.title("Football Data Analysis Project")
     
@@ -88,9 +216,10 @@ if page == "Project Info":
         # Show basic dataset stats
         st.markdown('<div class="highlight">', unsafe_allow_html=True)
         st.subheader("Dataset Statistics")
-        st.write(f"Total Matches: {len(processed_data):,}")
-        st.write(f"Total Features: {len(processed_data.columns):,}")
-        st.write(f"Date Range: {processed_data['Date'].min()} to {processed_data['Date'].max()}")
+        processed_summary = sheet_summary("Processed Data")
+        st.write(f"Total Matches: {processed_summary['rows']:,}")
+        st.write(f"Total Features: {processed_summary['columns']:,}")
+        st.write(f"Date Range: {processed_summary['date_min']} to {processed_summary['date_max']}")
         st.markdown('</div>', unsafe_allow_html=True)
     
     # Data Structure
@@ -128,15 +257,15 @@ if page == "Project Info":
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        missing_values = processed_data.isnull().sum().sum()
+        missing_values = processed_summary['missing']
         st.metric("Missing Values", missing_values)
     
     with col2:
-        duplicates = len(processed_data[processed_data.duplicated()])
+        duplicates = processed_summary['duplicates']
         st.metric("Duplicate Rows", duplicates)
     
     with col3:
-        completeness = ((1 - processed_data.isnull().sum().sum() / (processed_data.shape[0] * processed_data.shape[1])) * 100)
+        completeness = ((1 - processed_summary['missing'] / (processed_summary['rows'] * processed_summary['columns'])) * 100)
         st.metric("Data Completeness", f"{completeness:.2f}%")
     
     # Sample Visualizations
@@ -144,17 +273,18 @@ if page == "Project Info":
     
     # Home vs Away Win Distribution
     fig_results = px.pie(
-        raw_data, 
+        aggregates['outcomes'],
         names='FTR',
+        values='count',
         title='Match Outcomes Distribution (H: Home Win, A: Away Win, D: Draw)',
         color_discrete_sequence=px.colors.qualitative.Set3
     )
-    st.plotly_chart(fig_results)
+    show_chart(fig_results)
     
     # Goals Distribution
     fig_goals = go.Figure()
-    fig_goals.add_trace(go.Histogram(x=raw_data['FTHG'], name='Home Goals'))
-    fig_goals.add_trace(go.Histogram(x=raw_data['FTAG'], name='Away Goals'))
+    for name, binned in aggregates['goal_bins'].items():
+        fig_goals.add_trace(chart_data.binned_trace(binned, name=name))
     fig_goals.update_layout(
         barmode='overlay',
         title='Distribution of Goals Scored',
@@ -162,7 +292,7 @@ if page == "Project Info":
         yaxis_title='Frequency'
     )
     fig_goals.update_traces(opacity=0.75)
-    st.plotly_chart(fig_goals)
+    show_chart(fig_goals)
 
 elif page == "Team Analysis":
     st.header("Team Analysis")
@@ -172,37 +302,30 @@ elif page == "Team Analysis":
     with col1:
         team = st.selectbox("Select a team", sorted(raw_data['HomeTeam'].unique()))
     with col2:
-        window = st.selectbox("Select time window", [5, 15, 38])
+        team_matches, prefix = load_prefix_sums(data_version())
+        max_window = max(int(prefix['position'].max()) + 1, 2)
+        window = st.slider("Select time window", 1, max_window, min(5, max_window))
     
-    # Get team stats
-    team_stats = processed_data[
-        (processed_data['HomeTeam'] == team) | 
-        (processed_data['AwayTeam'] == team)
-    ].copy()
+    # Get team stats for the window from the per-team prefix sums
+    window_stats, index = load_window_stats(window, data_version())
+    team_stats = window_stats.iloc[index['rows'][team]]
+    summary = index['summaries'][team][window]
     
     # Overall Performance Metrics
     st.subheader("Overall Performance")
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        home_goals = team_stats[f'Home_Goals_L{window}'].mean()
-        away_goals = team_stats[f'Away_Goals_L{window}'].mean()
-        st.metric("Avg Goals", f"{(home_goals + away_goals)/2:.2f}")
+        st.metric("Avg Goals", f"{(summary['Home_Goals'] + summary['Away_Goals'])/2:.2f}")
     
     with col2:
-        home_wins = team_stats[f'Home_Wins_L{window}'].mean()
-        away_wins = team_stats[f'Away_Wins_L{window}'].mean()
-        st.metric("Avg Wins", f"{(home_wins + away_wins)/2:.2f}")
+        st.metric("Avg Wins", f"{(summary['Home_Wins'] + summary['Away_Wins'])/2:.2f}")
     
     with col3:
-        home_form = team_stats[f'Home_Form_L{window}'].mean()
-        away_form = team_stats[f'Away_Form_L{window}'].mean()
-        st.metric("Form %", f"{(home_form + away_form)/2:.1f}%")
+        st.metric("Form %", f"{(summary['Home_Form'] + summary['Away_Form'])/2:.1f}%")
     
     with col4:
-        home_clean = team_stats[f'Home_CleanSheets_L{window}'].mean()
-        away_clean = team_stats[f'Away_CleanSheets_L{window}'].mean()
-        st.metric("Clean Sheets", f"{(home_clean + away_clean)/2:.2f}")
+        st.metric("Clean Sheets", f"{(summary['Home_CleanSheets'] + summary['Away_CleanSheets'])/2:.2f}")
     
     # Detailed Statistics
     col1, col2 = st.columns(2)
@@ -210,34 +333,34 @@ elif page == "Team Analysis":
     with col1:
         # Shooting Efficiency
         fig_shooting = go.Figure()
-        fig_shooting.add_trace(go.Scatter(
-            y=team_stats[f'Home_ShotConversion_L{window}'],
+        fig_shooting.add_trace(chart_data.line_trace(
+            team_stats[f'Home_ShotConversion_L{window}'],
             name='Shot Conversion %',
             line=dict(color='blue')
         ))
-        fig_shooting.add_trace(go.Scatter(
-            y=team_stats[f'Home_ShotAccuracy_L{window}'],
+        fig_shooting.add_trace(chart_data.line_trace(
+            team_stats[f'Home_ShotAccuracy_L{window}'],
             name='Shot Accuracy %',
             line=dict(color='green')
         ))
         fig_shooting.update_layout(title=f"{team}'s Shooting Efficiency")
-        st.plotly_chart(fig_shooting)
+        show_chart(fig_shooting)
     
     with col2:
         # Form Analysis
         fig_form = go.Figure()
-        fig_form.add_trace(go.Scatter(
-            y=team_stats[f'Home_Form_L{window}'],
+        fig_form.add_trace(chart_data.line_trace(
+            team_stats[f'Home_Form_L{window}'],
             name='Home Form',
             line=dict(color='blue')
         ))
-        fig_form.add_trace(go.Scatter(
-            y=team_stats[f'Away_Form_L{window}'],
+        fig_form.add_trace(chart_data.line_trace(
+            team_stats[f'Away_Form_L{window}'],
             name='Away Form',
             line=dict(color='red')
         ))
         fig_form.update_layout(title=f"{team}'s Form Analysis")
-        st.plotly_chart(fig_form)
+        show_chart(fig_form)
     
     # Discipline Analysis
     st.subheader("Discipline Analysis")
@@ -248,35 +371,29 @@ elif page == "Team Analysis":
         fig_cards.add_trace(go.Bar(
             name='Yellow Cards',
             x=['Home', 'Away'],
-            y=[
-                team_stats[f'Home_YellowCards_L{window}'].mean(),
-                team_stats[f'Away_YellowCards_L{window}'].mean()
-            ]
+            y=[summary['Home_YellowCards'], summary['Away_YellowCards']]
         ))
         fig_cards.add_trace(go.Bar(
             name='Red Cards',
             x=['Home', 'Away'],
-            y=[
-                team_stats[f'Home_RedCards_L{window}'].mean(),
-                team_stats[f'Away_RedCards_L{window}'].mean()
-            ]
+            y=[summary['Home_RedCards'], summary['Away_RedCards']]
         ))
         fig_cards.update_layout(title=f"{team}'s Card Analysis", barmode='group')
-        st.plotly_chart(fig_cards)
+        show_chart(fig_cards)
     
     with col2:
         # Fouls Analysis
         fig_fouls = go.Figure()
-        fig_fouls.add_trace(go.Box(
-            y=team_stats[f'Home_Fouls_L{window}'],
+        fig_fouls.add_trace(chart_data.box_trace(
+            team_stats[f'Home_Fouls_L{window}'],
             name='Home Fouls'
         ))
-        fig_fouls.add_trace(go.Box(
-            y=team_stats[f'Away_Fouls_L{window}'],
+        fig_fouls.add_trace(chart_data.box_trace(
+            team_stats[f'Away_Fouls_L{window}'],
             name='Away Fouls'
         ))
         fig_fouls.update_layout(title=f"{team}'s Fouls Distribution")
-        st.plotly_chart(fig_fouls)
+        show_chart(fig_fouls)
 
 elif page == "Data Comparison":
     st.header("Data Comparison")
@@ -288,9 +405,7 @@ elif page == "Data Comparison":
     with col1:
         team = st.selectbox("Select Team", sorted(raw_data['HomeTeam'].unique()))
     with col2:
-        stat = st.selectbox("Select Statistic", [
-            'Goals', 'Wins', 'Shots', 'ShotsOnTarget', 'Corners', 'Fouls'
-        ])
+        stat = st.selectbox("Select Statistic", COMPARISON_STATS)
     
     # Compare calculations
     comparison_data = processed_data[
@@ -308,18 +423,18 @@ elif page == "Data Comparison":
     
     # Visualization of comparison
     fig_comp = go.Figure()
-    fig_comp.add_trace(go.Scatter(
-        y=comparison_data[f'Home_{stat}_L5'],
+    fig_comp.add_trace(chart_data.line_trace(
+        comparison_data[f'Home_{stat}_L5'],
         name=f'Home {stat}',
         line=dict(color='blue')
     ))
-    fig_comp.add_trace(go.Scatter(
-        y=comparison_data[f'Away_{stat}_L5'],
+    fig_comp.add_trace(chart_data.line_trace(
+        comparison_data[f'Away_{stat}_L5'],
         name=f'Away {stat}',
         line=dict(color='red')
     ))
     fig_comp.update_layout(title=f"{team}'s {stat} Comparison")
-    st.plotly_chart(fig_comp)
+    show_chart(fig_comp)
 
 elif page == "Task Verification":
     st.header("Task Verification")
@@ -352,25 +467,27 @@ elif page == "Task Verification":
     
     # Data Quality Checks
     st.subheader("Data Quality Verification")
+    raw_summary = sheet_summary("Raw Data")
+    processed_summary = sheet_summary("Processed Data")
     col1, col2, col3 = st.columns(3)
     
     with col1:
         st.metric(
             "Rows Processed",
-            len(processed_data),
-            f"{len(processed_data) - len(raw_data):+d}"
+            processed_summary['rows'],
+            f"{processed_summary['rows'] - raw_summary['rows']:+d}"
         )
     
     with col2:
         st.metric(
             "Columns Added",
-            len(processed_data.columns),
-            f"{len(processed_data.columns) - len(raw_data.columns):+d}"
+            processed_summary['columns'],
+            f"{processed_summary['columns'] - raw_summary['columns']:+d}"
         )
     
     with col3:
-        completeness = (1 - processed_data.isnull().sum().sum() / 
-                       (processed_data.shape[0] * processed_data.shape[1])) * 100
+        completeness = (1 - processed_summary['missing'] / 
+                       (processed_summary['rows'] * processed_summary['columns'])) * 100
         st.metric("Data Completeness", f"{completeness:.1f}%")
 
 else:  # Detailed Analysis
@@ -409,40 +526,29 @@ else:  # Detailed Analysis
     
     with col2:
         # Show feature categories and their counts
-        feature_categories = {
-            'Match Info': len([col for col in processed_data.columns if col in ['Date', 'Time', 'HomeTeam', 'AwayTeam']]),
-            'Goals': len([col for col in processed_data.columns if 'Goal' in col]),
-            'Shots': len([col for col in processed_data.columns if 'Shot' in col]),
-            'Cards': len([col for col in processed_data.columns if 'Card' in col]),
-            'Form': len([col for col in processed_data.columns if 'Form' in col])
-        }
+        feature_categories = aggregates['feature_categories']
         fig = px.bar(
             x=list(feature_categories.keys()),
             y=list(feature_categories.values()),
             title='Feature Distribution by Category',
             labels={'x': 'Category', 'y': 'Number of Features'}
         )
-        st.plotly_chart(fig)
+        show_chart(fig)
     st.markdown('</div>', unsafe_allow_html=True)
     
     # Q2: Team Performance Analysis
     st.markdown('<div class="original">', unsafe_allow_html=True)
     st.write("**Q: Most relevant columns for team performance analysis?**")
     
-    # Calculate correlation matrix for key metrics
-    performance_cols = [
-        'FTHG', 'FTAG', 'Home_Goals_L5', 'Away_Goals_L5',
-        'Home_ShotConversion_L5', 'Away_ShotConversion_L5',
-        'Home_Form_L5', 'Away_Form_L5'
-    ]
-    corr_matrix = processed_data[performance_cols].corr()
+    # Correlation matrix for key metrics
+    corr_matrix = aggregates['correlation']
     
     fig = px.imshow(
         corr_matrix,
         title='Correlation Matrix of Key Performance Metrics',
         color_continuous_scale='RdBu'
     )
-    st.plotly_chart(fig)
+    show_chart(fig)
     
     st.markdown("""
     Key performance indicators by importance:
@@ -480,18 +586,11 @@ else:  # Detailed Analysis
         """)
         
         # Example of different scaling methods
-        example_metric = processed_data['Home_Form_L38'].dropna()
-        scaled_data = pd.DataFrame({
-            'Original': example_metric,
-            'MinMax': (example_metric - example_metric.min()) / (example_metric.max() - example_metric.min()),
-            'Standard': (example_metric - example_metric.mean()) / example_metric.std()
-        })
-        
         fig = go.Figure()
-        for col in scaled_data.columns:
-            fig.add_trace(go.Box(y=scaled_data[col], name=col))
+        for col, stats in aggregates['scaling_boxes'].items():
+            fig.add_trace(chart_data.stats_box_trace(stats, name=col))
         fig.update_layout(title='Comparison of Scaling Methods')
-        st.plotly_chart(fig)
+        show_chart(fig)
     
     with col2:
         st.markdown("""
@@ -512,22 +611,13 @@ else:  # Detailed Analysis
         
         # Show distribution before and after normalization
         fig = go.Figure()
-        fig.add_trace(go.Histogram(
-            x=processed_data['Home_Form_L38'],
-            name='Before Normalization',
-            opacity=0.75
-        ))
-        fig.add_trace(go.Histogram(
-            x=(processed_data['Home_Form_L38'] - processed_data['Home_Form_L38'].mean()) / 
-              processed_data['Home_Form_L38'].std(),
-            name='After Normalization',
-            opacity=0.75
-        ))
+        for name, binned in aggregates['normalization_bins'].items():
+            fig.add_trace(chart_data.binned_trace(binned, name=name, opacity=0.75))
         fig.update_layout(
             title='Distribution Before and After Normalization',
             barmode='overlay'
         )
-        st.plotly_chart(fig)
+        show_chart(fig)
     st.markdown('</div>', unsafe_allow_html=True)
     
     # Validation of Aggregated Statistics
@@ -554,14 +644,11 @@ else:  # Detailed Analysis
            - Historical benchmarking
         """)
         
-        # Example: Confidence Intervals
-        team_stats = processed_data.groupby('HomeTeam')['Home_Goals_L38'].mean()
-        team_std = processed_data.groupby('HomeTeam')['Home_Goals_L38'].std()
-        confidence = 0.95
-        z_score = 1.96  # 95% confidence interval
-        
-        ci_lower = team_stats - z_score * (team_std / np.sqrt(len(team_stats)))
-        ci_upper = team_stats + z_score * (team_std / np.sqrt(len(team_stats)))
+        # Example: 95% Confidence Intervals
+        team_ci = aggregates['team_ci']
+        team_stats = team_ci['mean']
+        ci_lower = team_ci['ci_lower']
+        ci_upper = team_ci['ci_upper']
         
         fig = go.Figure()
         fig.add_trace(go.Box(
@@ -590,7 +677,7 @@ else:  # Detailed Analysis
             yaxis_title='Average Goals',
             showlegend=True
         )
-        st.plotly_chart(fig)
+        show_chart(fig)
     
     with col2:
         st.markdown("""
@@ -612,35 +699,33 @@ else:  # Detailed Analysis
         """)
         
         # Show sample size effect
-        sample_sizes = [5, 15, 38]
-        variances = []
-        for size in sample_sizes:
-            stat_name = f'Home_Goals_L{size}'
-            variances.append(processed_data[stat_name].std())
+        variances = aggregates['window_deviations']
         
         fig = px.bar(
-            x=['Last 5', 'Last 15', 'Last 38'],
-            y=variances,
+            x=[f'Last {n}' for n in variances.index],
+            y=variances.values,
             title='Statistical Variance by Sample Size',
             labels={'x': 'Sample Size', 'y': 'Standard Deviation'}
         )
-        st.plotly_chart(fig)
+        show_chart(fig)
     st.markdown('</div>', unsafe_allow_html=True)
     
     # Missing Values Analysis
     st.markdown('<div class="new">', unsafe_allow_html=True)
     st.write("**Missing Values Analysis**")
     
-    missing_data = processed_data.isnull().sum()
-    missing_pct = (missing_data / len(processed_data)) * 100
+    missing_pct = aggregates['missing']
     
-    fig = px.bar(
-        x=missing_pct[missing_pct > 0].index,
-        y=missing_pct[missing_pct > 0].values,
-        title='Percentage of Missing Values by Column',
-        labels={'x': 'Column', 'y': 'Missing %'}
-    )
-    st.plotly_chart(fig)
+    if missing_pct.empty:
+        st.write("No missing values in the processed data.")
+    else:
+        fig = px.bar(
+            x=missing_pct.index,
+            y=missing_pct.values,
+            title='Percentage of Missing Values by Column',
+            labels={'x': 'Column', 'y': 'Missing %'}
+        )
+        show_chart(fig)
     st.markdown('</div>', unsafe_allow_html=True)
     
     # Data Distribution
@@ -648,14 +733,13 @@ else:  # Detailed Analysis
     st.write("**Data Distribution Analysis**")
     
     # Show distribution of a key metric
-    fig = px.histogram(
-        processed_data,
-        x='Home_Form_L38',
+    fig = chart_data.binned_histogram_with_box(
+        aggregates['form_bins'],
+        aggregates['form_box'],
         title='Distribution of Home Form (L38)',
-        labels={'Home_Form_L38': 'Form %'},
-        marginal='box'
+        label='Form %'
     )
-    st.plotly_chart(fig)
+    show_chart(fig)
     st.markdown('</div>', unsafe_allow_html=True)
     
     # Feature Engineering Section
@@ -668,14 +752,7 @@ else:  # Detailed Analysis
     col1, col2 = st.columns(2)
     with col1:
         # Calculate win rate by card ranges
-        processed_data['YellowCard_Level'] = pd.qcut(
-            processed_data['Home_YellowCards_L5'],
-            q=4,
-            labels=['Low', 'Medium', 'High', 'Very High']
-        )
-        win_rate = processed_data.groupby('YellowCard_Level')['FTR'].apply(
-            lambda x: (x == 'H').mean() * 100
-        )
+        win_rate = aggregates['yellow_win_rate']
         
         fig = px.bar(
             x=win_rate.index,
@@ -683,13 +760,11 @@ else:  # Detailed Analysis
             title='Home Win Rate by Yellow Card History',
             labels={'x': 'Yellow Card Level', 'y': 'Win Rate (%)'}
         )
-        st.plotly_chart(fig)
+        show_chart(fig)
     
     with col2:
         # Red Card Analysis
-        red_card_impact = processed_data.groupby(
-            processed_data['Home_RedCards_L5'] > 0
-        )['FTR'].apply(lambda x: (x == 'H').mean() * 100)
+        red_card_impact = aggregates['red_win_rate']
         
         fig = px.bar(
             x=['No Red Cards', 'Has Red Cards'],
@@ -697,7 +772,7 @@ else:  # Detailed Analysis
             title='Win Rate: Impact of Recent Red Cards',
             labels={'x': 'Red Card History', 'y': 'Win Rate (%)'}
         )
-        st.plotly_chart(fig)
+        show_chart(fig)
     st.markdown('</div>', unsafe_allow_html=True)
     
     # Time-based Analysis
@@ -708,12 +783,7 @@ else:  # Detailed Analysis
     
     with col1:
         # Seasonal Trends
-        processed_data['Month'] = pd.to_datetime(processed_data['Date']).dt.month
-        monthly_stats = processed_data.groupby('Month').agg({
-            'FTHG': 'mean',
-            'FTAG': 'mean',
-            'Home_Form_L5': 'mean'
-        })
+        monthly_stats = aggregates['monthly']
         
         fig = go.Figure()
         fig.add_trace(go.Scatter(
@@ -733,7 +803,7 @@ else:  # Detailed Analysis
             xaxis_title='Month',
             yaxis_title='Average Goals'
         )
-        st.plotly_chart(fig)
+        show_chart(fig)
     
     with col2:
         # Form Trends
@@ -743,7 +813,7 @@ else:  # Detailed Analysis
             title='Home Team Form Trends by Month',
             labels={'Home_Form_L5': 'Average Form %'}
         )
-        st.plotly_chart(fig)
+        show_chart(fig)
     st.markdown('</div>', unsafe_allow_html=True)
     
     # Model Considerations
@@ -764,12 +834,13 @@ else:  # Detailed Analysis
         
         # Show class distribution
         fig = px.pie(
-            processed_data,
+            aggregates['outcomes'],
             names='FTR',
+            values='count',
             title='Target Variable Distribution',
             color_discrete_sequence=px.colors.qualitative.Set3
         )
-        st.plotly_chart(fig)
+        show_chart(fig)
     
     with col2:
         st.markdown("""
@@ -795,9 +866,14 @@ else:  # Detailed Analysis
             title='Simulated Feature Importance',
             labels={'x': 'Feature Category', 'y': 'Importance Score'}
         )
-        st.plotly_chart(fig)
+        show_chart(fig)
     st.markdown('</div>', unsafe_allow_html=True)
 
+if DEBUG:
+    st.sidebar.caption(
+        f"Chart payload: {sum(chart_payloads) / 1024:,.1f} KB in {len(chart_payloads)} charts"
+    )
+
 # Footer
 st.markdown("---")
 st.markdown("### Contact Information")
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+import chart_data
+
+def correlation_matrix(df, columns):
+    return df[list(columns)].corr()
+
+def scaling_comparison(df, column):
+    """Box statistics of the column and its min-max and standard scaled versions."""
+    values = df[column].dropna().astype(np.float64)
+    scaled = {
+        'Original': values,
+        'MinMax': (values - values.min()) / (values.max() - values.min()),
+        'Standard': (values - values.mean()) / values.std(),
+    }
+    return {name: chart_data.box_stats(scaled_values) for name, scaled_values in scaled.items()}
+
+def standardized(df, column):
+    """Histogram bins of the column before and after standardization."""
+    values = df[column].astype(np.float64)
+    return {
+        'Before Normalization': chart_data.histogram_bins(values),
+        'After Normalization': chart_data.histogram_bins((values - values.mean()) / values.std()),
+    }
+
+def team_confidence_intervals(df, team_column, value_column, z_score=1.96):
+    """Per-team mean of a column with a z_score confidence interval."""
+    grouped = df.groupby(team_column, observed=True)[value_column]
+    stats = pd.DataFrame({'mean': grouped.mean(), 'std': grouped.std()})
+    margin = z_score * (stats['std'] / np.sqrt(len(stats)))
+    stats['ci_lower'] = stats['mean'] - margin
+    stats['ci_upper'] = stats['mean'] + margin
+    return stats
+
+def window_deviations(df, stat, windows):
+    """Standard deviation of Home_<stat>_L<n> for each window."""
+    return pd.Series({n: df[f'Home_{stat}_L{n}'].std() for n in windows})
+
+def missing_percentages(df):
+    """Percentage of missing values for the columns that have any."""
+    missing_pct = df.isnull().sum() / len(df) * 100
+    return missing_pct[missing_pct > 0]
+
+def home_win_rate_by_quartile(df, column, labels):
+    """Home win rate (%) per quartile of a column."""
+    levels = pd.qcut(df[column], q=len(labels), labels=list(labels))
+    home_win = df['FTR'] == 'H'
+    return home_win.groupby(levels, observed=False).mean() * 100
+
+def home_win_rate_by_flag(df, column):
+    """Home win rate (%) for matches with and without a non-zero value in column."""
+    home_win = df['FTR'] == 'H'
+    return home_win.groupby(df[column] > 0).mean().reindex([False, True]) * 100
+
+def monthly_means(df, columns):
+    """Mean of the columns per calendar month of the match date."""
+    month = pd.to_datetime(df['Date']).dt.month.rename('Month')
+    return df[list(columns)].groupby(month).mean()
+
+def value_distribution(df, column):
+    """Counts of each value of a column, for pie charts."""
+    return df[column].value_counts().rename_axis(column).reset_index(name='count')
@@ -0,0 +1,156 @@
+import os
+import pickle
+import sys
+import time
+
+import chart_data
+import compaction
+import dashboard_analytics as analytics
+import rolling_engine
+import sheet_cache
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_FILE = "dashboard_snapshot.pkl"
+
+WINDOWS = [5, 15, 38]
+COMPARISON_STATS = ['Goals', 'Wins', 'Shots', 'ShotsOnTarget', 'Corners', 'Fouls']
+
+# Raw match columns the rolling stats of any window are computed from
+TEAM_ANALYSIS_COLUMNS = ['Incremental_ID', 'HomeTeam', 'AwayTeam', 'FTR'] + sorted({
+    col for columns in rolling_engine.FOR_AGAINST_COLUMNS.values() for col in columns
+})
+COMPARISON_COLUMNS = ['Date', 'HomeTeam', 'AwayTeam'] + [
+    f'{side}_{stat}_L5' for stat in COMPARISON_STATS for side in ['Home', 'Away']
+]
+
+# Sheets and columns each page reads; None loads every column
+PAGE_DATA = {
+    "Project Info": {"Raw Data": ['FTR', 'FTHG', 'FTAG']},
+    "Team Analysis": {"Raw Data": TEAM_ANALYSIS_COLUMNS},
+    "Data Comparison": {"Raw Data": ['HomeTeam'], "Processed Data": COMPARISON_COLUMNS},
+    "Task Verification": {},
+    "Detailed Analysis": {"Processed Data": None},
+}
+
+SUMMARY_SHEETS = ["Raw Data", "Processed Data"]
+
+def sheet_summary(df):
+    """Shape and data quality figures of a sheet."""
+    return {
+        'rows': len(df),
+        'columns': len(df.columns),
+        'missing': int(df.isnull().sum().sum()),
+        'duplicates': int(df.duplicated().sum()),
+        'date_min': df['Date'].min() if 'Date' in df else None,
+        'date_max': df['Date'].max() if 'Date' in df else None,
+    }
+
+def project_info_aggregates(page_data):
+    raw_data = page_data["Raw Data"]
+    return {
+        'outcomes': analytics.value_distribution(raw_data, 'FTR'),
+        'goal_bins': {
+            'Home Goals': chart_data.histogram_bins(raw_data['FTHG']),
+            'Away Goals': chart_data.histogram_bins(raw_data['FTAG']),
+        },
+    }
+
+def detailed_analysis_aggregates(page_data):
+    processed_data = page_data["Processed Data"]
+    columns = processed_data.columns
+    performance_cols = (
+        'FTHG', 'FTAG', 'Home_Goals_L5', 'Away_Goals_L5',
+        'Home_ShotConversion_L5', 'Away_ShotConversion_L5',
+        'Home_Form_L5', 'Away_Form_L5'
+    )
+    return {
+        'feature_categories': {
+            'Match Info': len([col for col in columns if col in ['Date', 'Time', 'HomeTeam', 'AwayTeam']]),
+            'Goals': len([col for col in columns if 'Goal' in col]),
+            'Shots': len([col for col in columns if 'Shot' in col]),
+            'Cards': len([col for col in columns if 'Card' in col]),
+            'Form': len([col for col in columns if 'Form' in col]),
+        },
+        'correlation': analytics.correlation_matrix(processed_data, performance_cols),
+        'scaling_boxes': analytics.scaling_comparison(processed_data, 'Home_Form_L38'),
+        'normalization_bins': analytics.standardized(processed_data, 'Home_Form_L38'),
+        'team_ci': analytics.team_confidence_intervals(
+            processed_data, 'HomeTeam', 'Home_Goals_L38', 1.96
+        ),
+        'window_deviations': analytics.window_deviations(processed_data, 'Goals', tuple(WINDOWS)),
+        'missing': analytics.missing_percentages(processed_data),
+        'form_bins': chart_data.histogram_bins(processed_data['Home_Form_L38']),
+        'form_box': chart_data.box_stats(processed_data['Home_Form_L38']),
+        'yellow_win_rate': analytics.home_win_rate_by_quartile(
+            processed_data, 'Home_YellowCards_L5',
+            ('Low', 'Medium', 'High', 'Very High')
+        ),
+        'red_win_rate': analytics.home_win_rate_by_flag(processed_data, 'Home_RedCards_L5'),
+        'monthly': analytics.monthly_means(processed_data, ('FTHG', 'FTAG', 'Home_Form_L5')),
+        'outcomes': analytics.value_distribution(processed_data, 'FTR'),
+    }
+
+# Pages rendered from small precomputed aggregates: page -> function(page_data)
+PAGE_AGGREGATES = {
+    "Project Info": project_info_aggregates,
+    "Detailed Analysis": detailed_analysis_aggregates,
+}
+
+def build_snapshot(excel_file, path=SNAPSHOT_FILE, processed_file=None):
+    """Precompute everything the dashboard shows into one versioned bundle.
+
+    The bundle holds the sheet summaries, the aggregates of the pages in
+    PAGE_AGGREGATES and the compacted frames the other pages filter
+    interactively, so the dashboard can serve it without the workbook.
+    'Processed Data' is read from `processed_file` when it is given, e.g.
+    the output of the 'excel' sink, instead of from the workbook itself.
+    """
+    fingerprint = sheet_cache.workbook_fingerprint(excel_file)
+    sheets = {
+        sheet: sheet_cache.read_sheet(
+            processed_file if processed_file and sheet == "Processed Data" else excel_file, sheet
+        )
+        for sheet in SUMMARY_SHEETS
+    }
+
+    pages = {}
+    aggregates = {}
+    for page, sheet_columns in PAGE_DATA.items():
+        page_data = {
+            sheet: compaction.compact_frame(sheets[sheet][columns] if columns else sheets[sheet])
+            for sheet, columns in sheet_columns.items()
+        }
+        if page in PAGE_AGGREGATES:
+            aggregates[page] = PAGE_AGGREGATES[page](page_data)
+            pages[page] = {}
+        else:
+            pages[page] = page_data
+
+    bundle = {
+        'version': SNAPSHOT_VERSION,
+        'source': os.path.basename(excel_file),
+        'fingerprint': fingerprint,
+        'created': time.time(),
+        'summaries': {sheet: sheet_summary(df) for sheet, df in sheets.items()},
+        'pages': pages,
+        'aggregates': aggregates,
+    }
+    tmp_file = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_file, 'wb') as f:
+        pickle.dump(bundle, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_file, path)
+    return bundle
+
+def load_snapshot(path=SNAPSHOT_FILE):
+    """Read a bundle written by build_snapshot."""
+    with open(path, 'rb') as f:
+        bundle = pickle.load(f)
+    if bundle.get('version') != SNAPSHOT_VERSION:
+        raise ValueError(f'Unsupported snapshot version in {path}')
+    return bundle
+
+if __name__ == "__main__":
+    excel_file = sys.argv[1] if len(sys.argv) > 1 else "Football Data Test Task.xlsx"
+    output_file = sys.argv[2] if len(sys.argv) > 2 else SNAPSHOT_FILE
+    build_snapshot(excel_file, output_file)
+    print(f"Snapshot of {excel_file} written to {output_file} ({os.path.getsize(output_file) / 1024:,.1f} KB)")
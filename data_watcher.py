@@ -0,0 +1,118 @@
+import os
+import threading
+import traceback
+import zipfile
+
+import analyze_football_data
+import dashboard_snapshot
+import sheet_cache
+import sinks
+
+POLL_SECONDS = 5.0
+# Sink the watcher processes into; the source workbook itself is never rewritten
+PROCESSED_SINK = 'excel'
+
+class DataWatcher:
+    """Keep a dashboard snapshot in step with the workbook from a background thread.
+
+    The workbook is polled for changes. Once a change has settled (the file
+    looks the same on two polls in a row, so a save in progress is not read
+    half-written), the incremental pipeline appends the new matches to the
+    'Processed Data' of a separate `processed_file` (the workbook may be
+    open in Excel), a new snapshot bundle is built, and `snapshot` is
+    swapped to it in one assignment: readers see the old bundle or the new
+    one, never a partial update, and never wait for Excel parsing or
+    feature computation once the first bundle exists. The last failure is
+    kept in `error` until a build succeeds.
+    """
+
+    def __init__(self, excel_file, snapshot_file=dashboard_snapshot.SNAPSHOT_FILE,
+                 state_file=None, processed_file=None, interval=POLL_SECONDS, process=True):
+        self.excel_file = excel_file
+        self.snapshot_file = snapshot_file
+        self.state_file = state_file or f'{os.path.splitext(excel_file)[0]}.state.json'
+        self.processed_file = processed_file or sinks.default_output(excel_file, PROCESSED_SINK)
+        self.interval = interval
+        self.process = process
+        self.snapshot = None
+        self.error = None
+        self._seen = None
+        self._pending = None
+        self._attempted = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='data-watcher', daemon=True)
+
+    def _signature(self):
+        stat = os.stat(self.excel_file)
+        return stat.st_mtime_ns, stat.st_size
+
+    def start(self):
+        """Serve an up-to-date bundle from disk if there is one, then start watching."""
+        if os.path.exists(self.snapshot_file):
+            try:
+                bundle = dashboard_snapshot.load_snapshot(self.snapshot_file)
+                if bundle['fingerprint'] == sheet_cache.workbook_fingerprint(self.excel_file):
+                    self._seen = self._signature()
+                    self._swap(bundle)
+            except (OSError, ValueError, KeyError) as e:
+                print(f'Ignoring snapshot {self.snapshot_file}: {e}')
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def current(self, timeout=None):
+        """The latest bundle, waiting at most `timeout` for the first build attempt.
+
+        Returns None if no bundle exists yet, e.g. because the first build
+        failed (see `error`) or is still running.
+        """
+        self._attempted.wait(timeout)
+        return self.snapshot
+
+    def check(self):
+        """Rebuild the bundle if the workbook changed since the last build."""
+        signature = self._signature()
+        # An empty file is a save that has not been written out yet
+        if signature == self._seen or signature[1] == 0:
+            return False
+        if signature != self._pending and self.snapshot is not None:
+            self._pending = signature
+            return False
+        if self.process:
+            if os.path.exists(self.state_file) and not os.path.exists(self.processed_file):
+                # The state only continues the output it was saved with; start over
+                os.remove(self.state_file)
+            print(f'{self.excel_file} changed, processing new matches...')
+            analyze_football_data.main(
+                self.excel_file, state_file=self.state_file,
+                sink=PROCESSED_SINK, output_file=self.processed_file
+            )
+        bundle = dashboard_snapshot.build_snapshot(
+            self.excel_file, self.snapshot_file, self.processed_file if self.process else None
+        )
+        # A save made while processing changes the signature again and is picked up next poll
+        self._seen = signature
+        self._swap(bundle)
+        return True
+
+    def _swap(self, bundle):
+        self.snapshot = bundle
+        self.error = None
+        self._attempted.set()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.check()
+            except zipfile.BadZipFile:
+                self.error = f'{self.excel_file} is still being written'
+                print(f'{self.error}, retrying')
+            except Exception as e:
+                # Keep serving the last good bundle; retry on the next poll
+                self.error = f'{type(e).__name__}: {e}'
+                traceback.print_exc()
+            self._attempted.set()
+            self._stopped.wait(self.interval)
@@ -0,0 +1,57 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+ELO_START = 1500.0
+ELO_K = 20.0
+# Rating points added to the home team when computing the expected result
+HOME_ADVANTAGE = 60.0
+
+# Match score of the home team for each full-time result
+HOME_SCORE = {'H': 1.0, 'D': 0.5, 'A': 0.0}
+
+def update_ratings(state, matches, k=ELO_K, home_advantage=HOME_ADVANTAGE):
+    """Walk the matches once in Incremental_ID order, updating Elo ratings.
+
+    `state` holds {'ratings': {team: rating}} and is updated in place, so a
+    later call continues from where this one stopped: a new matchday costs
+    O(new matches). Ratings carry over between seasons and divisions. Returns
+    pre-match Home_Elo/Away_Elo and the expected score of each side
+    (Home_EloExpected/Away_EloExpected), aligned with `matches`.
+    """
+    saved = state.setdefault('ratings', {})
+    order = np.argsort(matches['Incremental_ID'].to_numpy(), kind='mergesort')
+    home = matches['HomeTeam'].astype(str).to_numpy()[order]
+    away = matches['AwayTeam'].astype(str).to_numpy()[order]
+    scores = matches['FTR'].map(HOME_SCORE).to_numpy(dtype=np.float64)[order]
+
+    codes, teams = pd.factorize(np.concatenate([home, away]))
+    home_codes, away_codes = codes[:len(home)], codes[len(home):]
+    ratings = np.array([saved.get(team, ELO_START) for team in teams], dtype=np.float64)
+
+    home_elo = np.empty(len(home))
+    away_elo = np.empty(len(home))
+    expected = np.empty(len(home))
+    for i in range(len(home)):
+        h, a = home_codes[i], away_codes[i]
+        home_elo[i] = ratings[h]
+        away_elo[i] = ratings[a]
+        expected[i] = 1 / (1 + math.pow(10, (away_elo[i] - home_elo[i] - home_advantage) / 400))
+        if not math.isnan(scores[i]):
+            delta = k * (scores[i] - expected[i])
+            ratings[h] += delta
+            ratings[a] -= delta
+
+    saved.update(zip(teams, ratings.tolist()))
+    features = pd.DataFrame({
+        'Home_Elo': home_elo,
+        'Away_Elo': away_elo,
+        'Home_EloExpected': expected,
+        'Away_EloExpected': 1 - expected,
+    }, index=matches.index[order])
+    return features.reindex(matches.index)
+
+def calculate_elo_features(df, k=ELO_K, home_advantage=HOME_ADVANTAGE):
+    """Elo features of a full match history, starting every team at ELO_START."""
+    return update_ratings({}, df, k, home_advantage)
@@ -0,0 +1,197 @@
+import re
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+STORE_FILE = 'football_features.db'
+MATCH_TABLE = 'matches'
+TEAM_TABLE = 'team_matches'
+VIEW_NAME = 'processed_matches'
+# Column order of the processed frame, so the view keeps the sheet's layout
+COLUMNS_TABLE = 'processed_columns'
+
+# Home_<feature> / Away_<feature> columns of the processed frame
+SIDE_PATTERN = re.compile(r'^(Home|Away)_(.+)$')
+# Columns copied from the match onto each team-match row
+TEAM_KEY_COLUMNS = ['Incremental_ID', 'Team', 'IsHome', 'Date', 'Div']
+
+def split_features(processed_df):
+    """Split the wide processed frame into a match table and a team-match table.
+
+    Every Home_<feature>/Away_<feature> pair becomes one <feature> column of
+    the team-match table, with one row per team per match.
+    """
+    side_columns = {'Home': [], 'Away': []}
+    for col in processed_df.columns:
+        match = SIDE_PATTERN.match(col)
+        if match:
+            side_columns[match.group(1)].append(col)
+    feature_columns = [col for col in processed_df.columns
+                       if not SIDE_PATTERN.match(col)]
+    matches = processed_df[feature_columns]
+
+    sides = []
+    for side, team_col in [('Home', 'HomeTeam'), ('Away', 'AwayTeam')]:
+        team_side = pd.DataFrame({
+            'Incremental_ID': processed_df['Incremental_ID'].to_numpy(),
+            'Team': processed_df[team_col].to_numpy(),
+            'IsHome': int(side == 'Home'),
+            'Date': processed_df['Date'].to_numpy(),
+        })
+        if 'Div' in processed_df:
+            team_side['Div'] = processed_df['Div'].to_numpy()
+        features = processed_df[side_columns[side]].reset_index(drop=True)
+        features = features.set_axis([SIDE_PATTERN.match(col).group(2) for col in features.columns], axis=1)
+        sides.append(pd.concat([team_side, features], axis=1))
+    return matches, pd.concat(sides, ignore_index=True)
+
+def _sql_type(dtype):
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'REAL'
+    return 'TEXT'
+
+def _quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+def _table_columns(con, table):
+    return [row[1] for row in con.execute(f'PRAGMA table_info({_quote(table)})')]
+
+def _ensure_table(con, table, frame, key):
+    """Create the table keyed on `key`, or add any columns it is missing."""
+    existing = _table_columns(con, table)
+    if not existing:
+        columns = ', '.join(f'{_quote(col)} {_sql_type(frame[col].dtype)}' for col in frame.columns)
+        keys = ', '.join(_quote(col) for col in key)
+        con.execute(f'CREATE TABLE {_quote(table)} ({columns}, PRIMARY KEY ({keys}))')
+        return
+    for col in frame.columns:
+        if col not in existing:
+            con.execute(f'ALTER TABLE {_quote(table)} ADD COLUMN {_quote(col)} {_sql_type(frame[col].dtype)}')
+
+def _rows(frame):
+    """Frame rows as Python values sqlite3 can bind (NaN -> NULL, dates -> ISO text)."""
+    frame = frame.copy()
+    for col in frame.columns:
+        if pd.api.types.is_datetime64_any_dtype(frame[col]):
+            frame[col] = frame[col].dt.strftime('%Y-%m-%d %H:%M:%S')
+        elif isinstance(frame[col].dtype, pd.CategoricalDtype):
+            frame[col] = frame[col].astype(object)
+    frame = frame.astype(object).where(frame.notna(), None)
+    return frame.itertuples(index=False, name=None)
+
+def _upsert(con, table, frame):
+    columns = ', '.join(_quote(col) for col in frame.columns)
+    placeholders = ', '.join('?' for _ in frame.columns)
+    con.executemany(
+        f'INSERT OR REPLACE INTO {_quote(table)} ({columns}) VALUES ({placeholders})',
+        _rows(frame)
+    )
+
+def _create_indexes(con):
+    con.execute(f'CREATE INDEX IF NOT EXISTS idx_team_date ON {TEAM_TABLE} (Team, Date)')
+    if 'Div' in _table_columns(con, TEAM_TABLE):
+        con.execute(f'CREATE INDEX IF NOT EXISTS idx_div_date ON {TEAM_TABLE} (Div, Date)')
+    con.execute(f'CREATE INDEX IF NOT EXISTS idx_match_date ON {MATCH_TABLE} (Date)')
+
+def _save_column_order(con, columns):
+    """Record the processed frame's column order, keeping columns it lacks at the end."""
+    con.execute(f'CREATE TABLE IF NOT EXISTS {COLUMNS_TABLE} (position INTEGER PRIMARY KEY, name TEXT)')
+    saved = [row[0] for row in con.execute(f'SELECT name FROM {COLUMNS_TABLE} ORDER BY position')]
+    order = list(columns) + [col for col in saved if col not in set(columns)]
+    con.execute(f'DELETE FROM {COLUMNS_TABLE}')
+    con.executemany(f'INSERT INTO {COLUMNS_TABLE} VALUES (?, ?)', enumerate(order))
+
+def _create_view(con):
+    """(Re)create the wide match-level view in the column order of the processed frame."""
+    features = [col for col in _table_columns(con, TEAM_TABLE) if col not in TEAM_KEY_COLUMNS]
+    selected = {col: f'm.{_quote(col)}' for col in _table_columns(con, MATCH_TABLE)}
+    for alias, side in [('h', 'Home'), ('a', 'Away')]:
+        selected.update({
+            f'{side}_{col}': f'{alias}.{_quote(col)} AS {_quote(f"{side}_{col}")}' for col in features
+        })
+    order = [row[0] for row in con.execute(f'SELECT name FROM {COLUMNS_TABLE} ORDER BY position')]
+    order = [col for col in order if col in selected]
+    order += [col for col in selected if col not in set(order)]
+    con.execute(f'DROP VIEW IF EXISTS {VIEW_NAME}')
+    con.execute(
+        f'CREATE VIEW {VIEW_NAME} AS SELECT {", ".join(selected[col] for col in order)} '
+        f'FROM {MATCH_TABLE} m '
+        f'JOIN {TEAM_TABLE} h ON h.Incremental_ID = m.Incremental_ID AND h.IsHome = 1 '
+        f'JOIN {TEAM_TABLE} a ON a.Incremental_ID = m.Incremental_ID AND a.IsHome = 0'
+    )
+
+def upsert(processed_df, path=STORE_FILE):
+    """Insert or replace processed matches in the store, keyed on Incremental_ID."""
+    matches, team_matches = split_features(processed_df)
+    with sqlite3.connect(path) as con:
+        _ensure_table(con, MATCH_TABLE, matches, ['Incremental_ID'])
+        _ensure_table(con, TEAM_TABLE, team_matches, ['Incremental_ID', 'IsHome'])
+        _upsert(con, MATCH_TABLE, matches)
+        _upsert(con, TEAM_TABLE, team_matches)
+        _create_indexes(con)
+        _save_column_order(con, processed_df.columns)
+        _create_view(con)
+    con.close()
+
+def write_store(processed_df, path=STORE_FILE):
+    """Replace the store contents with the processed matches."""
+    with sqlite3.connect(path) as con:
+        con.execute(f'DROP VIEW IF EXISTS {VIEW_NAME}')
+        con.execute(f'DROP TABLE IF EXISTS {TEAM_TABLE}')
+        con.execute(f'DROP TABLE IF EXISTS {MATCH_TABLE}')
+        con.execute(f'DROP TABLE IF EXISTS {COLUMNS_TABLE}')
+    con.close()
+    upsert(processed_df, path)
+
+def _query(path, sql, params):
+    with sqlite3.connect(path) as con:
+        frame = pd.read_sql(sql, con, params=params, parse_dates=['Date'])
+    con.close()
+    return frame
+
+def _date_filter(start, end):
+    clauses, params = [], []
+    if start is not None:
+        clauses.append('Date >= ?')
+        params.append(pd.Timestamp(start).strftime('%Y-%m-%d %H:%M:%S'))
+    if end is not None:
+        clauses.append('Date <= ?')
+        params.append(pd.Timestamp(end).strftime('%Y-%m-%d %H:%M:%S'))
+    return clauses, params
+
+def _feature_columns(path, windows):
+    with sqlite3.connect(path) as con:
+        columns = _table_columns(con, TEAM_TABLE)
+    con.close()
+    if windows is None:
+        return columns
+    suffixes = tuple(f'_L{n}' for n in windows)
+    return [col for col in columns if col in TEAM_KEY_COLUMNS or col.endswith(suffixes)]
+
+def team_features(team, start=None, end=None, windows=None, path=STORE_FILE):
+    """One team's rolling features between two dates, served by the (Team, Date) index."""
+    clauses, params = _date_filter(start, end)
+    columns = ', '.join(_quote(col) for col in _feature_columns(path, windows))
+    where = ' AND '.join(['Team = ?'] + clauses)
+    return _query(path, f'SELECT {columns} FROM {TEAM_TABLE} WHERE {where} ORDER BY Date, Incremental_ID',
+                  [team] + params)
+
+def division_features(div, start=None, end=None, windows=None, path=STORE_FILE):
+    """Every team's rolling features in a division, served by the (Div, Date) index."""
+    clauses, params = _date_filter(start, end)
+    columns = ', '.join(_quote(col) for col in _feature_columns(path, windows))
+    where = ' AND '.join(['Div = ?'] + clauses)
+    return _query(path, f'SELECT {columns} FROM {TEAM_TABLE} WHERE {where} ORDER BY Date, Incremental_ID',
+                  [div] + params)
+
+def read_matches(path=STORE_FILE, start=None, end=None):
+    """The wide match-level view, in the layout of the 'Processed Data' sheet."""
+    clauses, params = _date_filter(start, end)
+    where = f' WHERE {" AND ".join(clauses)}' if clauses else ''
+    frame = _query(path, f'SELECT * FROM {VIEW_NAME}{where} ORDER BY Incremental_ID', params)
+    features = [col for col in frame.columns if SIDE_PATTERN.match(col)]
+    frame[features] = frame[features].astype(np.float64)
+    return frame
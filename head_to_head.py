@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+
+from rolling_engine import FOR_AGAINST_COLUMNS
+
+# Meetings per team pair covered by the H2H_*_L<n> columns
+H2H_WINDOWS = [3, 5]
+
+# Per-meeting counts taken from each side: name -> (home column, away column)
+SIDE_COLUMNS = {stat: FOR_AGAINST_COLUMNS[stat] for stat in ['Goals', 'Shots', 'ShotsOnTarget']}
+
+def pair_keys(df):
+    """The two teams of every match in a fixed order, so both venues share a key."""
+    home = df['HomeTeam'].astype(str).to_numpy()
+    away = df['AwayTeam'].astype(str).to_numpy()
+    home_first = home <= away
+    return np.where(home_first, home, away), np.where(home_first, away, home), home_first
+
+def build_pair_index(df):
+    """Row positions of every meeting of each unordered team pair.
+
+    Returns {(team, team): positions} with the teams sorted by name and the
+    positions in Incremental_ID order.
+    """
+    first, second, _ = pair_keys(df)
+    order = np.argsort(df['Incremental_ID'].to_numpy(), kind='mergesort')
+    meetings = pd.Series(order).groupby([first[order], second[order]], sort=False)
+    return {pair: rows.to_numpy() for pair, rows in meetings}
+
+def meeting_records(df):
+    """Every match as one meeting counted from its pair's first team's side."""
+    _, _, home_first = pair_keys(df)
+    ftr = df['FTR'].to_numpy()
+    home_win = ftr == 'H'
+    away_win = ftr == 'A'
+    meetings = {
+        'FirstWins': np.where(home_first, home_win, away_win),
+        'SecondWins': np.where(home_first, away_win, home_win),
+        'Draws': ftr == 'D',
+        'Meetings': np.ones(len(df)),
+    }
+    for stat, (home_col, away_col) in SIDE_COLUMNS.items():
+        home_values = df[home_col].fillna(0).to_numpy(dtype=np.float64)
+        away_values = df[away_col].fillna(0).to_numpy(dtype=np.float64)
+        meetings[f'First{stat}'] = np.where(home_first, home_values, away_values)
+        meetings[f'Second{stat}'] = np.where(home_first, away_values, home_values)
+    return pd.DataFrame(meetings).astype(np.float64)
+
+def side_features(window_sums, home_first):
+    """H2H_*_L<n> columns from {n: summed meetings}, read from each match's home side."""
+    features = {}
+    flip = ~home_first
+    for n, sums in window_sums.items():
+        features[f'H2H_Meetings_L{n}'] = sums['Meetings'].to_numpy()
+        features[f'H2H_Draws_L{n}'] = sums['Draws'].to_numpy()
+        for stat in ['Wins'] + list(SIDE_COLUMNS):
+            first_values = sums[f'First{stat}'].to_numpy()
+            second_values = sums[f'Second{stat}'].to_numpy()
+            features[f'H2H_Home{stat}_L{n}'] = np.where(flip, second_values, first_values)
+            features[f'H2H_Away{stat}_L{n}'] = np.where(flip, first_values, second_values)
+    return features
+
+def calculate_h2h_features(df, windows=H2H_WINDOWS):
+    """Head-to-head stats over each pair's last n meetings (current match included).
+
+    Every meeting is recorded from the pair's first team's side, summed per
+    pair with one grouped cumulative sum, and read back from the side of the
+    current match's home and away team. Returns H2H_*_L<n> columns aligned
+    with df.
+    """
+    first, second, home_first = pair_keys(df)
+    pair = pd.MultiIndex.from_arrays([first, second]).factorize()[0]
+
+    order = np.lexsort((df['Incremental_ID'].to_numpy(), pair))
+    meetings = meeting_records(df).iloc[order]
+    pairs = pd.Series(pair[order], index=meetings.index)
+    cumulative = meetings.groupby(pairs, sort=False).cumsum()
+    window_sums = {
+        n: cumulative - cumulative.groupby(pairs, sort=False).shift(n, fill_value=0)
+        for n in windows
+    }
+
+    features = pd.DataFrame(side_features(window_sums, home_first[order]), index=meetings.index)
+    return features.sort_index().set_axis(df.index)
+
+def update_h2h(state, matches, windows=H2H_WINDOWS):
+    """Head-to-head stats of new matches, continuing from each pair's saved meetings.
+
+    `state` holds {'pairs': {"team\tteam": last meetings}} with the last
+    max(windows) meetings of every pair and is updated in place. The new
+    matches are grouped with build_pair_index, so a call costs O(new
+    matches) whatever the length of the history. Returns the same columns
+    as calculate_h2h_features, aligned with `matches`.
+    """
+    saved = state.setdefault('pairs', {})
+    keep = max(windows)
+    meetings = meeting_records(matches)
+    values = meetings.to_numpy()
+    sums = {n: np.empty_like(values) for n in windows}
+
+    for (first, second), rows in build_pair_index(matches).items():
+        key = f'{first}\t{second}'
+        history = np.array(saved.get(key, []), dtype=np.float64).reshape(-1, values.shape[1])
+        combined = np.vstack([history, values[rows]])
+        cumulative = np.vstack([np.zeros((1, values.shape[1])), combined.cumsum(axis=0)])
+        ends = np.arange(len(history) + 1, len(combined) + 1)
+        for n in windows:
+            sums[n][rows] = cumulative[ends] - cumulative[np.maximum(ends - n, 0)]
+        saved[key] = combined[-keep:].tolist()
+
+    window_sums = {n: pd.DataFrame(sums[n], columns=meetings.columns) for n in windows}
+    return pd.DataFrame(side_features(window_sums, pair_keys(matches)[2]), index=matches.index)
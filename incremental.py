@@ -0,0 +1,136 @@
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+import rolling_engine
+from rolling_engine import BASE_STATS, EW_STATS, WINDOWS
+
+STATE_VERSION = 1
+
+def build_state(df, window=max(WINDOWS), half_lives=()):
+    """Build the per-team rolling state from a full match history.
+
+    For every team the state keeps the base stats of its last `window`
+    matches (oldest first) and their running totals, plus the latest
+    exponentially weighted value of each EW stat for every half-life.
+    """
+    team_matches = rolling_engine.build_team_matches(df)
+    recent = team_matches.groupby('Team', sort=False).tail(window)
+
+    teams = {}
+    for team, rows in recent.groupby('Team', sort=False):
+        history = rows[BASE_STATS].to_numpy(np.float64)
+        teams[team] = {
+            'history': history.tolist(),
+            'totals': history.sum(axis=0).tolist(),
+            'ew': {},
+        }
+
+    if half_lives:
+        smoothed = pd.DataFrame(rolling_engine.ew_features(team_matches, half_lives))
+        latest = smoothed.groupby(team_matches['Team'].to_numpy(), sort=False).last()
+        for team, values in latest.iterrows():
+            teams[team]['ew'] = {
+                str(h): [float(values[f'{stat}_EW{h}']) for stat in EW_STATS]
+                for h in half_lives
+            }
+
+    return {
+        'version': STATE_VERSION,
+        'window': window,
+        'half_lives': list(half_lives),
+        'last_id': int(df['Incremental_ID'].max()) if len(df) else 0,
+        'teams': teams,
+    }
+
+def update_state(state, new_matches, windows=WINDOWS):
+    """Push new matches into the state and return their processed rows.
+
+    Only the teams involved in `new_matches` are touched. The returned rows
+    carry the same Home_*/Away_* columns as a full recompute, including the
+    *_EW<h> features for the half-lives the state was built with.
+    """
+    window = state['window']
+    if max(windows) > window:
+        raise ValueError(f'State only keeps the last {window} matches per team')
+
+    team_matches = rolling_engine.build_team_matches(new_matches)
+    values = team_matches[BASE_STATS].to_numpy(np.float64)
+    sums = {n: np.empty_like(values) for n in windows}
+    half_lives = state.get('half_lives', [])
+    ew_values = rolling_engine.ew_inputs(team_matches).to_numpy()
+    smoothed = {h: np.empty_like(ew_values) for h in half_lives}
+
+    for row, team in enumerate(team_matches['Team']):
+        entry = state['teams'].setdefault(
+            team, {'history': [], 'totals': [0.0] * len(BASE_STATS), 'ew': {}}
+        )
+        history = entry['history']
+        totals = np.asarray(entry['totals']) + values[row]
+        history.append(values[row].tolist())
+        if len(history) > window:
+            totals -= history.pop(0)
+        entry['totals'] = totals.tolist()
+
+        for n in windows:
+            if n == window:
+                sums[n][row] = totals
+            else:
+                sums[n][row] = np.sum(history[-n:], axis=0)
+
+        for h in half_lives:
+            previous = entry['ew'].get(str(h))
+            current = rolling_engine.ew_step(
+                None if previous is None else np.asarray(previous), ew_values[row], rolling_engine.ew_alpha(h)
+            )
+            entry['ew'][str(h)] = current.tolist()
+            smoothed[h][row] = current
+
+    features = {}
+    for n in windows:
+        features.update(rolling_engine.derive_stats(
+            pd.DataFrame(sums[n], columns=BASE_STATS), n
+        ))
+    for h in half_lives:
+        features.update(rolling_engine.ew_columns(smoothed[h], h))
+    features = pd.DataFrame(features, index=team_matches.index)
+
+    if len(new_matches):
+        state['last_id'] = max(state['last_id'], int(new_matches['Incremental_ID'].max()))
+    return rolling_engine.attach_team_features(new_matches, team_matches, features)
+
+def history_digest(df, last_id):
+    """Row count and hash of the matches up to last_id.
+
+    Numbers are hashed as float64, so a column turning float when a later
+    match has a missing value does not count as an edit.
+    """
+    rows = df[df['Incremental_ID'] <= last_id].sort_values('Incremental_ID', kind='mergesort')
+    rows = rows.apply(
+        lambda col: col.astype(np.float64) if pd.api.types.is_numeric_dtype(col) else col.astype(str)
+    )
+    hashed = pd.util.hash_pandas_object(rows, index=False).to_numpy()
+    return {'rows': len(rows), 'hash': hashlib.sha1(hashed.tobytes()).hexdigest()}
+
+def history_unchanged(df, state):
+    """Whether the matches already in the state are unchanged, so df only appends to them."""
+    return state.get('history') == history_digest(df, state['last_id'])
+
+def new_matches_since(df, state):
+    """Return the matches that have not been pushed into the state yet."""
+    return df[df['Incremental_ID'] > state['last_id']]
+
+def save_state(state, path):
+    """Write the rolling state to disk as JSON."""
+    with open(path, 'w') as f:
+        json.dump(state, f)
+
+def load_state(path):
+    """Read a rolling state written by save_state."""
+    with open(path) as f:
+        state = json.load(f)
+    if state.get('version') != STATE_VERSION:
+        raise ValueError(f'Unsupported state version in {path}')
+    return state
@@ -0,0 +1,119 @@
+import glob
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+import incremental
+from rolling_engine import WINDOWS
+
+# Columns of the football-data.co.uk CSV format used by the rolling stats
+COUNT_COLUMNS = [
+    'FTHG', 'FTAG', 'HS', 'AS', 'HST', 'AST', 'HF', 'AF',
+    'HC', 'AC', 'HY', 'AY', 'HR', 'AR'
+]
+USECOLS = [
+    'Div', 'Date', 'Time', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG', 'FTR',
+    'HS', 'AS', 'HST', 'AST', 'HF', 'AF', 'HC', 'AC', 'HY', 'AY', 'HR', 'AR'
+]
+
+def expand_paths(patterns):
+    """Expand file paths and glob patterns, keeping the given order.
+
+    A file matched by several patterns is listed once.
+    """
+    paths = []
+    seen = set()
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern))
+        for path in matches if matches else [pattern]:
+            key = os.path.normcase(os.path.abspath(path))
+            if key not in seen:
+                seen.add(key)
+                paths.append(path)
+    return paths
+
+def normalize_chunk(chunk):
+    """Project a raw CSV chunk onto USECOLS with compact, consistent dtypes."""
+    chunk = chunk.rename(columns=lambda c: c.strip())
+    chunk = chunk.dropna(subset=['HomeTeam', 'AwayTeam'])
+
+    out = pd.DataFrame(index=chunk.index)
+    for col in USECOLS:
+        values = chunk[col] if col in chunk else pd.Series(np.nan, index=chunk.index)
+        if col == 'Date':
+            out[col] = parse_dates(values)
+        elif col in COUNT_COLUMNS:
+            out[col] = pd.to_numeric(values, errors='coerce').astype(np.float32)
+        else:
+            out[col] = values.astype('string').str.strip()
+    return out
+
+def parse_dates(values):
+    return pd.to_datetime(values, dayfirst=True, format='mixed')
+
+def first_match_date(path):
+    """Earliest match date in a CSV file, reading only its Date column."""
+    dates = pd.read_csv(
+        path, usecols=lambda c: c.strip() == 'Date',
+        encoding='utf-8-sig', encoding_errors='replace'
+    ).iloc[:, 0]
+    return parse_dates(dates).min()
+
+def check_chronology(chunk, last_played, path):
+    """Raise if a team in the chunk goes back before a match already read."""
+    teams = pd.concat([chunk['HomeTeam'], chunk['AwayTeam']], ignore_index=True)
+    dates = pd.concat([chunk['Date'], chunk['Date']], ignore_index=True)
+    span = dates.groupby(teams).agg(['min', 'max'])
+    for team, first in span['min'].items():
+        if team in last_played and first < last_played[team]:
+            raise ValueError(
+                f'{path}: {team} plays on {first:%Y-%m-%d}, before a match on '
+                f'{last_played[team]:%Y-%m-%d} already read'
+            )
+    last_played.update(span['max'].dropna().to_dict())
+
+def iter_match_chunks(paths, chunksize=50_000):
+    """Stream matches from CSV files in chunks, numbering them with Incremental_ID.
+
+    Files are read in order of their earliest match and each chunk is sorted
+    by Date, so every team's matches reach the rolling state chronologically;
+    a file that goes back in time for a team raises ValueError.
+    """
+    next_id = 1
+    last_played = {}
+    for path in sorted(paths, key=first_match_date):
+        reader = pd.read_csv(
+            path,
+            usecols=lambda c: c.strip() in USECOLS,
+            chunksize=chunksize,
+            encoding='utf-8-sig',
+            encoding_errors='replace',
+        )
+        for chunk in reader:
+            chunk = normalize_chunk(chunk).sort_values('Date', kind='mergesort').reset_index(drop=True)
+            check_chronology(chunk, last_played, path)
+            chunk.insert(0, 'Incremental_ID', np.arange(next_id, next_id + len(chunk)))
+            next_id += len(chunk)
+            yield chunk
+
+def process_archive(paths, output_file, windows=WINDOWS, chunksize=50_000):
+    """Compute rolling stats for a CSV archive with bounded memory.
+
+    Only one chunk plus the per-team rolling state is held at a time; the
+    processed rows are appended to `output_file` as CSV. Returns the state.
+    """
+    state = None
+    first = True
+    for chunk in iter_match_chunks(paths, chunksize):
+        if state is None:
+            state = incremental.build_state(chunk.iloc[:0], window=max(windows))
+        rows = incremental.update_state(state, chunk, windows)
+        rows.to_csv(output_file, mode='w' if first else 'a', header=first, index=False)
+        first = False
+    return state
+
+if __name__ == "__main__":
+    output_file, *patterns = sys.argv[1:]
+    process_archive(expand_paths(patterns), output_file)
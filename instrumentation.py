@@ -0,0 +1,82 @@
+import cProfile
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+class Metrics:
+    """Record per-stage timings as JSON lines.
+
+    Timers are always on and cost microseconds per stage. Peak memory is
+    measured with tracemalloc only when `trace_memory` is set, since tracing
+    slows pandas code down several times. With `profile_file` the whole run
+    is also profiled with cProfile and dumped on close().
+    """
+
+    def __init__(self, path=None, trace_memory=False, profile_file=None):
+        self.file = open(path, 'a') if path else None
+        self.trace_memory = trace_memory
+        self.profile_file = profile_file
+        self.profiler = None
+        self._peaks = []
+        self._started_tracing = False
+
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        if profile_file:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    @contextmanager
+    def stage(self, name, **fields):
+        """Time the enclosed block and write one metrics record for it."""
+        if self.trace_memory:
+            self._enter_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record = {
+                'stage': name,
+                'seconds': round(time.perf_counter() - start, 6),
+                **fields,
+            }
+            if self.trace_memory:
+                record['peak_mb'] = round(self._exit_peak() / 1e6, 3)
+            self.write(record)
+
+    def _enter_peak(self):
+        # Fold the current peak into the enclosing stage before resetting it
+        peak = tracemalloc.get_traced_memory()[1]
+        if self._peaks:
+            self._peaks[-1] = max(self._peaks[-1], peak)
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        self._peaks.append(0)
+
+    def _exit_peak(self):
+        peak = max(self._peaks.pop(), tracemalloc.get_traced_memory()[1])
+        if self._peaks:
+            self._peaks[-1] = max(self._peaks[-1], peak)
+        return peak
+
+    def write(self, record):
+        if self.file:
+            self.file.write(json.dumps({'time': time.time(), **record}, default=str) + '\n')
+            self.file.flush()
+
+    def close(self):
+        if self.profiler:
+            self.profiler.disable()
+            self.profiler.dump_stats(self.profile_file)
+            self.profiler = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        if self.file:
+            self.file.close()
+            self.file = None
+
+# Default for callers that do not collect metrics: timers run, nothing is written
+NO_METRICS = Metrics()
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+from rolling_engine import BASE_STATS, build_team_matches, derive_stats, prefix_sums
+
+def build_history_index(df):
+    """Index every team's matches by date for point-in-time queries.
+
+    Returns {'teams': {team: (start, end) rows}, 'dates': match dates,
+    'cumulative': per-team prefix sums of the base stats} with each team's
+    rows contiguous and sorted by date.
+    """
+    team_matches = build_team_matches(df)
+    team_matches['Date'] = pd.to_datetime(df['Date']).reindex(team_matches['MatchIndex']).to_numpy()
+    team_matches = team_matches.sort_values(['Team', 'Date'], kind='mergesort').reset_index(drop=True)
+
+    teams = team_matches['Team'].to_numpy(object)
+    boundaries = np.flatnonzero(teams[1:] != teams[:-1]) + 1
+    starts = np.concatenate([[0], boundaries])
+    ends = np.concatenate([boundaries, [len(teams)]])
+    return {
+        'teams': {teams[start]: (start, end) for start, end in zip(starts, ends)},
+        'dates': team_matches['Date'].to_numpy(dtype='datetime64[ns]'),
+        'cumulative': prefix_sums(team_matches)['cumulative'],
+    }
+
+def stats_as_of_batch(index, queries, inclusive=False):
+    """Rolling stats for many (team, date, n) queries at once.
+
+    Each answer covers the team's last n matches before `date` (on or before
+    it with `inclusive`), so dates between or after fixtures work too. Teams
+    are located with a binary search over their dates, and the window sums
+    come from two prefix-sum lookups per query.
+    """
+    if isinstance(queries, pd.DataFrame):
+        queries = queries.set_axis(['Team', 'Date', 'N'], axis=1)
+    else:
+        queries = pd.DataFrame(list(queries), columns=['Team', 'Date', 'N'])
+    teams = queries['Team'].to_numpy(object)
+    dates = pd.to_datetime(queries['Date']).to_numpy(dtype='datetime64[ns]')
+    n = queries['N'].to_numpy(dtype=np.int64)
+
+    unknown = sorted(set(teams) - set(index['teams']))
+    if unknown:
+        raise ValueError(f'Unknown teams: {", ".join(map(str, unknown))}')
+
+    # Rows of each query's team and how many of its matches precede the date
+    start = np.empty(len(queries), dtype=np.int64)
+    played = np.empty(len(queries), dtype=np.int64)
+    side = 'right' if inclusive else 'left'
+    for team in pd.unique(teams):
+        mask = teams == team
+        first, last = index['teams'][team]
+        start[mask] = first
+        played[mask] = np.searchsorted(index['dates'][first:last], dates[mask], side=side)
+
+    cumulative = np.vstack([np.zeros((1, len(BASE_STATS))), index['cumulative']])
+    # Row r of the index is row r + 1 of the padded prefix sums
+    end = np.where(played > 0, start + played, 0)
+    begin = np.where(played > n, start + played - n, 0)
+    sums = pd.DataFrame(cumulative[end] - cumulative[begin], columns=BASE_STATS)
+
+    result = queries.assign(Date=dates, Matches=sums['Played'].to_numpy())
+    return pd.concat([result, pd.DataFrame(derive_stats(sums))], axis=1)
+
+def stats_as_of(index, team, date, n, inclusive=False):
+    """Rolling stats of one team over its last n matches as of a date."""
+    return stats_as_of_batch(index, [(team, date, n)], inclusive).iloc[0]
@@ -1,6 +1,10 @@
 import pandas as pd
 import numpy as np
 
+import compaction
+import sinks
+from instrumentation import NO_METRICS
+
 def calculate_rolling_stats(df, team_col, match_counts=[5, 15, 38]):
     """Calculate rolling statistics for each team."""
     teams = df[team_col].unique()
@@ -70,36 +74,60 @@ def calculate_rolling_stats(df, team_col, match_counts=[5, 15, 38]):
     
     return all_stats
 
-def process_football_data(input_file, sheet_name='Raw Data'):
-    """Main function to process football data."""
+def attach_rolling_stats(df, home_stats, away_stats, match_counts=[5, 15, 38]):
+    """Attach rolling statistics to every match as whole columns.
+
+    Home and away stats share column names, so the away team's values,
+    missing ones included, replace the home team's in every match whose away
+    team has stats.
+    """
+    blocks = []
+    for n in match_counts:
+        home_block = _stats_block(df, 'HomeTeam', home_stats[n])
+        away_block = _stats_block(df, 'AwayTeam', away_stats[n])
+        has_away = df['AwayTeam'].isin(list(away_stats[n])).to_numpy()[:, None]
+        has_away = np.broadcast_to(has_away, home_block.shape)
+        blocks.append(home_block.mask(has_away, away_block[home_block.columns]))
+    
+    features = pd.concat(blocks, axis=1)
+    base = df.drop(columns=features.columns, errors='ignore')
+    return pd.concat([base, features], axis=1)
+
+def _stats_block(df, team_col, team_stats):
+    """Build one frame of rolling stats for the team in team_col of each match."""
+    parts = []
+    for team, stats in team_stats.items():
+        rows = df.index[df[team_col] == team]
+        parts.append(pd.DataFrame(stats).reindex(rows))
+    return pd.concat(parts).reindex(df.index)
+
+def process_football_data(input_file, sheet_name='Raw Data', compact=False, metrics=NO_METRICS,
+                          sink='workbook', output_file=None):
+    """Main function to process football data.
+
+    Results go to the named sink (see sinks.SINKS); the default 'workbook'
+    sink replaces the 'Processed Data' sheet of the input workbook.
+    """
     # Read the Excel file
-    df = pd.read_excel(input_file, sheet_name=sheet_name)
+    with metrics.stage('read'):
+        df = pd.read_excel(input_file, sheet_name=sheet_name)
     
     # Calculate stats for both home and away teams
-    home_stats = calculate_rolling_stats(df, 'HomeTeam')
-    away_stats = calculate_rolling_stats(df, 'AwayTeam')
+    with metrics.stage('rolling'):
+        home_stats = calculate_rolling_stats(df, 'HomeTeam')
+        away_stats = calculate_rolling_stats(df, 'AwayTeam')
     
     # Create new columns in the dataframe
-    for n in [5, 15, 38]:
-        for team_idx, row in df.iterrows():
-            home_team = row['HomeTeam']
-            away_team = row['AwayTeam']
-            
-            # Add home team stats
-            if home_team in home_stats[n]:
-                for stat, values in home_stats[n][home_team].items():
-                    if team_idx in values.index:
-                        df.at[team_idx, stat] = values[team_idx]
-            
-            # Add away team stats
-            if away_team in away_stats[n]:
-                for stat, values in away_stats[n][away_team].items():
-                    if team_idx in values.index:
-                        df.at[team_idx, stat] = values[team_idx]
+    with metrics.stage('merge'):
+        df = attach_rolling_stats(df, home_stats, away_stats)
+    
+    if compact:
+        with metrics.stage('compact'):
+            df = compaction.compact_frame(df, report=True)
     
-    # Save the processed data to a new sheet
-    with pd.ExcelWriter(input_file, mode='a', if_sheet_exists='replace', engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='Processed Data', index=False)
+    # Save the processed data
+    with metrics.stage('write', sink=sink):
+        sinks.write_output(df, sink, output_file or sinks.default_output(input_file, sink))
 
 if __name__ == "__main__":
     input_file = "Football Data Test Task.xlsx"
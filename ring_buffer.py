@@ -0,0 +1,165 @@
+import numpy as np
+
+import stat_registry
+from rolling_engine import BASE_STATS, COMPILED_STATS, WINDOWS
+
+CAPACITY = max(WINDOWS)
+TEAM_NAME_LENGTH = 64
+
+def record_dtype(capacity=CAPACITY, windows=WINDOWS):
+    """One record per team: its last `capacity` matches, window sums and position."""
+    return np.dtype([
+        ('team', f'U{TEAM_NAME_LENGTH}'),
+        ('buffer', np.int16, (capacity, len(BASE_STATS))),
+        ('sums', np.int32, (len(windows), len(BASE_STATS))),
+        ('head', np.int32),
+        ('played', np.int64),
+        ('last_id', np.int64),
+    ])
+
+def _base_plan(compiled=COMPILED_STATS):
+    """How to read each base stat of one side from a match row.
+
+    Returns [(position, kind, home key, away key)] where kind is 'value'
+    (a match column) or 'equals' (1 when the match column equals the key).
+    """
+    plan = []
+    for position, name in enumerate(compiled['base']):
+        if name in compiled['for_against']:
+            home_col, away_col = compiled['for_against'][name]
+            plan.append((position, 'value', home_col, away_col))
+        elif name in compiled['counts']:
+            spec = compiled['counts'][name]
+            if spec['result'] is not None:
+                home_code, away_code = stat_registry.RESULT_CODES[spec['result']]
+                plan.append((position, 'equals', ('FTR', home_code), ('FTR', away_code)))
+            else:
+                home_col, away_col = compiled['for_against'][spec['zero']]
+                plan.append((position, 'equals', (home_col, 0), (away_col, 0)))
+        else:
+            plan.append((position, 'played', None, None))
+    return plan
+
+class TeamRingBuffer:
+    """Rolling team stats kept in fixed-size NumPy ring buffers.
+
+    Each team owns a `capacity` x base-stat int16 ring of its latest matches
+    and int32 running sums for every window, so update() costs the same for
+    every match and writes into preallocated arrays only. snapshot() returns
+    the same statistics as analyze_football_data.calculate_team_stats. The
+    whole state is one structured array, saved as a single .npy file that
+    load() can memory-map.
+    """
+
+    def __init__(self, capacity=CAPACITY, windows=WINDOWS, teams=16):
+        if max(windows) > capacity:
+            raise ValueError(f'Windows longer than the buffer capacity of {capacity} matches')
+        self.capacity = capacity
+        self.windows = list(windows)
+        self.records = np.zeros(teams, dtype=record_dtype(capacity, self.windows))
+        self.teams = {}
+        self._plan = _base_plan()
+        self._scratch = np.zeros(len(BASE_STATS), dtype=np.int16)
+
+    @classmethod
+    def from_matches(cls, df, capacity=CAPACITY, windows=WINDOWS):
+        """Build the buffers by pushing a match history in Incremental_ID order."""
+        buffers = cls(capacity, windows, teams=max(16, 2 * len(df['HomeTeam'].unique())))
+        for match in df.sort_values('Incremental_ID').to_dict('records'):
+            buffers.update(match)
+        return buffers
+
+    @property
+    def last_id(self):
+        """Highest Incremental_ID pushed so far (0 when empty)."""
+        if not self.teams:
+            return 0
+        return int(self.records['last_id'][:len(self.teams)].max())
+
+    def _team_row(self, team):
+        row = self.teams.get(team)
+        if row is None:
+            row = len(self.teams)
+            if row == len(self.records):
+                # Doubling keeps team inserts amortized constant time
+                grown = np.zeros(max(16, 2 * len(self.records)), dtype=self.records.dtype)
+                grown[:row] = self.records[:row]
+                self.records = grown
+            self.records['team'][row] = team
+            self.teams[team] = row
+        return row
+
+    def _push(self, row, match, is_home):
+        values = self._scratch
+        side = 2 if is_home else 3
+        for step in self._plan:
+            key = step[side]
+            if step[1] == 'value':
+                value = match[key]
+                values[step[0]] = 0 if value != value else value
+            elif step[1] == 'equals':
+                values[step[0]] = match[key[0]] == key[1]
+            else:
+                values[step[0]] = 1
+
+        record = self.records[row]
+        head = int(record['head'])
+        played = int(record['played'])
+        buffer = record['buffer']
+        sums = record['sums']
+        for position, n in enumerate(self.windows):
+            window_sums = sums[position]
+            if played >= n:
+                # The match leaving this window sits n slots behind the head
+                np.subtract(window_sums, buffer[(head - n) % self.capacity], out=window_sums)
+            np.add(window_sums, values, out=window_sums)
+        buffer[head] = values
+        record['head'] = (head + 1) % self.capacity
+        record['played'] = played + 1
+        record['last_id'] = match['Incremental_ID']
+
+    def update(self, match):
+        """Push one finished match (a mapping of match columns) for both teams."""
+        self._push(self._team_row(match['HomeTeam']), match, True)
+        self._push(self._team_row(match['AwayTeam']), match, False)
+
+    def window_sums(self, team, n):
+        """Base-stat sums over the team's last n matches, as an int64 array."""
+        if n > self.capacity:
+            raise ValueError(f'Only the last {self.capacity} matches are kept per team')
+        record = self.records[self.teams[team]]
+        if n in self.windows:
+            return record['sums'][self.windows.index(n)].astype(np.int64)
+        kept = min(n, int(record['played']))
+        slots = (int(record['head']) - 1 - np.arange(kept)) % self.capacity
+        return record['buffer'][slots].sum(axis=0, dtype=np.int64)
+
+    def snapshot(self, team, n):
+        """Statistics of the team's last n matches, as {'<stat>_L<n>': value}."""
+        sums = dict(zip(BASE_STATS, self.window_sums(team, n).astype(np.float64)))
+        stats = stat_registry.evaluate(sums, COMPILED_STATS)
+        return {f'{name}_L{n}': float(value) for name, value in stats.items()}
+
+    def save(self, path):
+        """Write the whole state as one .npy file."""
+        records = self.records[:len(self.teams)]
+        stored = np.lib.format.open_memmap(path, mode='w+', dtype=records.dtype, shape=records.shape)
+        stored[:] = records
+        stored.flush()
+        del stored
+
+    @classmethod
+    def load(cls, path, windows=WINDOWS, mmap=True):
+        """Open a saved state; with `mmap` updates write straight into the file.
+
+        A memory-mapped state is copied into memory when a new team has to be
+        added, after which save() is needed to persist it.
+        """
+        records = np.load(path, mmap_mode='r+' if mmap else None)
+        capacity = records.dtype['buffer'].shape[0]
+        if records.dtype != record_dtype(capacity, windows):
+            raise ValueError(f'{path} was saved with different windows or statistics')
+        buffers = cls(capacity, windows, teams=0)
+        buffers.records = records
+        buffers.teams = {str(team): row for row, team in enumerate(records['team'])}
+        return buffers
@@ -0,0 +1,239 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import numpy as np
+
+import stat_registry
+from instrumentation import NO_METRICS
+
+WINDOWS = [5, 15, 38]
+# Half-lives, in matches, of the exponentially weighted *_EW<h> features
+EW_HALF_LIVES = [5, 10]
+# Per-match values smoothed by the exponentially weighted features
+EW_STATS = ['Goals', 'GoalsConceded', 'Shots', 'Points']
+
+# Base columns and derived metrics of the stat registry
+COMPILED_STATS = stat_registry.compile_registry()
+
+# Per-team counting stats: name -> (value when team is home, value when team is away)
+FOR_AGAINST_COLUMNS = COMPILED_STATS['for_against']
+
+# Output order of the statistics, matching analyze_football_data.calculate_team_stats
+STAT_NAMES = COMPILED_STATS['names']
+
+BASE_STATS = COMPILED_STATS['base']
+
+def build_team_matches(df, compiled=COMPILED_STATS):
+    """Reshape the match table into one row per team per match.
+
+    The result holds the base columns of the compiled stat registry, is
+    sorted by team and Incremental_ID and keeps the original match index in
+    the 'MatchIndex' column.
+    """
+    sides = []
+    masks = {}
+    for is_home, team_col in [(True, 'HomeTeam'), (False, 'AwayTeam')]:
+        side = pd.DataFrame({
+            'MatchIndex': df.index,
+            'Incremental_ID': df['Incremental_ID'].to_numpy(),
+            'Team': df[team_col].to_numpy(),
+            'IsHome': is_home,
+        })
+        if 'Div' in df:
+            side['Div'] = df['Div'].to_numpy()
+        values = stat_registry.base_columns(df, compiled, is_home, masks)
+        side = pd.concat([side, pd.DataFrame(values)], axis=1)
+        sides.append(side)
+
+    team_matches = pd.concat(sides, ignore_index=True)
+    team_matches = team_matches.sort_values(['Team', 'Incremental_ID'], kind='mergesort')
+    return team_matches.reset_index(drop=True)
+
+def prefix_sums(team_matches):
+    """Per-team cumulative sums of every base stat.
+
+    Returns {'cumulative': array of running totals in team_matches order,
+    'position': each row's match number within its team (0-based)}.
+    """
+    teams = team_matches['Team']
+    cumulative = team_matches[BASE_STATS].groupby(teams, sort=False).cumsum()
+    return {
+        'cumulative': cumulative.to_numpy(dtype=np.float64),
+        'position': team_matches.groupby(teams, sort=False).cumcount().to_numpy(),
+    }
+
+def window_sums(team_matches, n, prefix=None):
+    """Sum every base stat over each team's last n matches (current match included).
+
+    Any n is answered from the prefix sums with two lookups per row: the
+    running total minus the total n matches earlier in the same team.
+    """
+    if prefix is None:
+        prefix = prefix_sums(team_matches)
+    cumulative = prefix['cumulative']
+    earlier = np.arange(len(cumulative)) - n
+    lagged = np.where(
+        (prefix['position'] >= n)[:, None],
+        cumulative[np.maximum(earlier, 0)],
+        0.0
+    )
+    return pd.DataFrame(cumulative - lagged, columns=BASE_STATS, index=team_matches.index)
+
+def derive_stats(sums, n=None, compiled=COMPILED_STATS):
+    """Turn window sums of the base stats into the published statistics.
+
+    Names get an _L<n> suffix; with n=None they are returned unsuffixed.
+    """
+    suffix = '' if n is None else f'_L{n}'
+    stats = stat_registry.evaluate(sums, compiled)
+    return {f'{name}{suffix}': values for name, values in stats.items()}
+
+def ew_alpha(half_life):
+    """Smoothing factor of an exponential average with the given half-life in matches."""
+    return 1 - 0.5 ** (1 / half_life)
+
+def ew_inputs(team_matches):
+    """Per-match values of the EW_STATS for every team-match row."""
+    values = team_matches[EW_STATS[:-1]].astype(np.float64)
+    values['Points'] = team_matches['Wins'] * 3 + team_matches['Draws']
+    return values
+
+def ew_step(previous, values, alpha):
+    """A team's running EW values after one more match (pandas ewm with adjust=False).
+
+    `previous` is None before the team's first match.
+    """
+    if previous is None:
+        return values
+    return (1 - alpha) * previous + alpha * values
+
+def ew_columns(smoothed, h):
+    """*_EW<h> features from an array of smoothed EW_STATS values, one row per team-match."""
+    features = {f'{stat}_EW{h}': smoothed[:, position] for position, stat in enumerate(EW_STATS)}
+    features[f'Form_EW{h}'] = smoothed[:, EW_STATS.index('Points')] / 3 * 100
+    return features
+
+def ew_features(team_matches, half_lives=EW_HALF_LIVES):
+    """Exponentially weighted stats over each team's matches (current match included).
+
+    Uses the recursive form (adjust=False): each team's state is one running
+    value per stat, so streaming updates cost the same per match however long
+    the history is. The recursion steps through every team's k-th match at
+    once with ew_step, the same step the incremental state applies. Form_EW<h>
+    is the smoothed points as a percentage of 3.
+    """
+    values = ew_inputs(team_matches).to_numpy()
+    codes, teams = pd.factorize(team_matches['Team'])
+    position = pd.Series(codes).groupby(codes).cumcount().to_numpy()
+    order = np.lexsort((codes, position))
+    steps = np.split(order, np.flatnonzero(np.diff(position[order])) + 1)
+
+    features = {}
+    for h in half_lives:
+        alpha = ew_alpha(h)
+        running = np.zeros((len(teams), values.shape[1]))
+        smoothed = np.empty_like(values)
+        for k, rows in enumerate(steps):
+            team_codes = codes[rows]
+            running[team_codes] = ew_step(None if k == 0 else running[team_codes], values[rows], alpha)
+            smoothed[rows] = running[team_codes]
+        features.update(ew_columns(smoothed, h))
+    return features
+
+def calculate_team_features(team_matches, windows=WINDOWS, metrics=NO_METRICS, prefix=None,
+                            half_lives=()):
+    """Calculate every rolling statistic for every team-match row in one pass.
+
+    With `half_lives` the exponentially weighted features are added as well.
+    """
+    if prefix is None:
+        with metrics.stage('prefix_sums'):
+            prefix = prefix_sums(team_matches)
+    features = {}
+    for n in windows:
+        with metrics.stage('window', window=n):
+            features.update(derive_stats(window_sums(team_matches, n, prefix), n))
+    if half_lives:
+        with metrics.stage('ew', half_lives=list(half_lives)):
+            features.update(ew_features(team_matches, half_lives))
+    return pd.DataFrame(features, index=team_matches.index)
+
+def partition_teams(team_matches, workers, partition='team'):
+    """Split the teams into `workers` groups of roughly equal match counts.
+
+    With partition='Div' each team is kept with the division it first appears
+    in, so workers receive whole divisions where possible.
+    """
+    if partition == 'Div':
+        units = team_matches.groupby('Team', sort=False)['Div'].first()
+    elif partition == 'team':
+        units = pd.Series(team_matches['Team'].unique(), index=team_matches['Team'].unique())
+    else:
+        raise ValueError(f'Unknown partition: {partition}')
+
+    sizes = team_matches['Team'].value_counts().groupby(units).sum()
+    loads = [0] * workers
+    groups = [[] for _ in range(workers)]
+    for unit, size in sizes.sort_values(ascending=False, kind='mergesort').items():
+        target = loads.index(min(loads))
+        groups[target].extend(units.index[units == unit])
+        loads[target] += size
+    return [group for group in groups if group]
+
+def calculate_team_features_parallel(team_matches, windows=WINDOWS, workers=2, partition='team',
+                                    half_lives=()):
+    """Calculate team features in a process pool, one group of teams per task.
+
+    Each worker only receives the rows of its own teams; results are merged
+    back in the original row order.
+    """
+    groups = partition_teams(team_matches, workers, partition)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                calculate_team_features,
+                team_matches.loc[team_matches['Team'].isin(group), BASE_STATS + ['Team']],
+                windows,
+                half_lives=half_lives,
+            )
+            for group in groups
+        ]
+        features = pd.concat([future.result() for future in futures])
+    return features.sort_index()
+
+def attach_team_features(df, team_matches, features):
+    """Attach per-team features to the match frame as Home_*/Away_* columns."""
+    is_home = team_matches['IsHome'].to_numpy()
+    match_index = team_matches['MatchIndex'].to_numpy()
+
+    home = features[is_home].set_axis(match_index[is_home]).add_prefix('Home_')
+    away = features[~is_home].set_axis(match_index[~is_home]).add_prefix('Away_')
+    return attach_side_features(df, home.reindex(df.index), away.reindex(df.index))
+
+def attach_side_features(df, home, away):
+    """Join home and away feature blocks onto the match frame in one operation.
+
+    Any existing columns with the same names are replaced.
+    """
+    new_columns = list(home.columns) + list(away.columns)
+    base = df.drop(columns=new_columns, errors='ignore')
+    return pd.concat([base, home, away], axis=1)
+
+def process_all_teams(df, windows=WINDOWS, workers=None, partition='team', metrics=NO_METRICS,
+                      half_lives=()):
+    """Vectorized replacement for analyze_football_data.process_all_teams.
+
+    With `half_lives` the Home_*_EW<h>/Away_*_EW<h> features are added in the
+    same pass.
+    """
+    with metrics.stage('reshape'):
+        team_matches = build_team_matches(df)
+    if workers and workers > 1:
+        with metrics.stage('teams_parallel', workers=workers, partition=partition):
+            features = calculate_team_features_parallel(
+                team_matches, windows, workers, partition, half_lives
+            )
+    else:
+        features = calculate_team_features(team_matches, windows, metrics, half_lives=half_lives)
+    with metrics.stage('merge'):
+        return attach_team_features(df, team_matches, features)
@@ -0,0 +1,58 @@
+import glob
+import hashlib
+import os
+
+import pandas as pd
+
+CACHE_DIR = ".sheet_cache"
+
+# (path, mtime, size) -> content hash, so a workbook is hashed once per change
+_fingerprints = {}
+
+def workbook_fingerprint(excel_file):
+    """Return a content hash of the workbook, recomputed only when it changes."""
+    stat = os.stat(excel_file)
+    key = (os.path.abspath(excel_file), stat.st_mtime_ns, stat.st_size)
+    if key not in _fingerprints:
+        digest = hashlib.sha1()
+        with open(excel_file, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        _fingerprints[key] = digest.hexdigest()[:16]
+    return _fingerprints[key]
+
+def _cache_prefix(excel_file, sheet_name, cache_dir):
+    stem = os.path.splitext(os.path.basename(excel_file))[0]
+    name = f"{stem}-{sheet_name}".replace(" ", "_")
+    return os.path.join(cache_dir, name)
+
+def read_sheet(excel_file, sheet_name, columns=None, cache_dir=CACHE_DIR):
+    """Read a workbook sheet through a Parquet cache.
+
+    The Excel file is only parsed when no cache exists for its current
+    content hash. Sheets that cannot be stored as Parquet are returned
+    uncached.
+    """
+    prefix = _cache_prefix(excel_file, sheet_name, cache_dir)
+    cache_file = f"{prefix}-{workbook_fingerprint(excel_file)}.parquet"
+
+    if os.path.exists(cache_file):
+        return pd.read_parquet(cache_file, columns=columns)
+
+    df = pd.read_excel(excel_file, sheet_name=sheet_name)
+    tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        df.to_parquet(tmp_file, index=False)
+        os.replace(tmp_file, cache_file)
+    except (ValueError, TypeError, NotImplementedError, ImportError) as e:
+        print(f"Not caching sheet '{sheet_name}': {e}")
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+    else:
+        # Drop caches built from older versions of the workbook
+        for stale in glob.glob(f"{glob.escape(prefix)}-*.parquet"):
+            if stale != cache_file:
+                os.remove(stale)
+
+    return df[columns] if columns is not None else df
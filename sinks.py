@@ -0,0 +1,102 @@
+import os
+import sqlite3
+
+import pandas as pd
+from openpyxl import Workbook
+
+import feature_store
+
+SHEET_NAME = 'Processed Data'
+TABLE_NAME = 'processed_data'
+
+# Rows converted to Python objects at a time by the streaming Excel writer
+EXCEL_CHUNK_ROWS = 10_000
+
+def write_workbook(df, path, sheet_name=SHEET_NAME):
+    """Replace one sheet of an existing workbook (rewrites the whole file)."""
+    with pd.ExcelWriter(path, mode='a', if_sheet_exists='replace', engine='openpyxl') as writer:
+        df.to_excel(writer, sheet_name=sheet_name, index=False)
+
+def write_excel(df, path, sheet_name=SHEET_NAME):
+    """Stream the frame into a new single-sheet workbook with openpyxl's write-only mode."""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_name)
+    ws.append([str(col) for col in df.columns])
+    for start in range(0, len(df), EXCEL_CHUNK_ROWS):
+        chunk = df.iloc[start:start + EXCEL_CHUNK_ROWS]
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        for row in chunk.itertuples(index=False, name=None):
+            ws.append(row)
+    wb.save(path)
+
+def write_parquet(df, path, sheet_name=SHEET_NAME):
+    df.to_parquet(path, index=False)
+
+def write_csv(df, path, sheet_name=SHEET_NAME):
+    df.to_csv(path, index=False)
+
+def write_sqlite(df, path, sheet_name=SHEET_NAME):
+    with sqlite3.connect(path) as con:
+        df.to_sql(TABLE_NAME, con, if_exists='replace', index=False, chunksize=10_000)
+    con.close()
+
+def read_workbook(path, sheet_name=SHEET_NAME):
+    return pd.read_excel(path, sheet_name=sheet_name)
+
+def read_parquet(path, sheet_name=SHEET_NAME):
+    return pd.read_parquet(path)
+
+def read_csv(path, sheet_name=SHEET_NAME):
+    return pd.read_csv(path, parse_dates=['Date'])
+
+def read_sqlite(path, sheet_name=SHEET_NAME):
+    with sqlite3.connect(path) as con:
+        df = pd.read_sql(f'SELECT * FROM {TABLE_NAME}', con, parse_dates=['Date'])
+    con.close()
+    return df
+
+def write_store(df, path, sheet_name=SHEET_NAME):
+    feature_store.write_store(df, path)
+
+def read_store(path, sheet_name=SHEET_NAME):
+    return feature_store.read_matches(path)
+
+# Sink name -> (writer, reader, file suffix for the default output path)
+SINKS = {
+    'workbook': (write_workbook, read_workbook, None),
+    'excel': (write_excel, read_workbook, '_processed.xlsx'),
+    'parquet': (write_parquet, read_parquet, '_processed.parquet'),
+    'csv': (write_csv, read_csv, '_processed.csv'),
+    'sqlite': (write_sqlite, read_sqlite, '_processed.db'),
+    'store': (write_store, read_store, '_features.db'),
+}
+
+# Sinks that can take just the new rows of an incremental run
+UPSERTS = {
+    'store': feature_store.upsert,
+}
+
+def default_output(input_file, sink):
+    """Where a sink writes by default: the source workbook itself or a file next to it."""
+    suffix = SINKS[sink][2]
+    if suffix is None:
+        return input_file
+    return os.path.splitext(input_file)[0] + suffix
+
+def write_output(df, sink, path):
+    """Write processed data with the named sink."""
+    if sink not in SINKS:
+        raise ValueError(f'Unknown sink: {sink}. Choose from {", ".join(SINKS)}')
+    SINKS[sink][0](df, path)
+
+def read_output(sink, path):
+    """Read processed data back from the named sink."""
+    if sink not in SINKS:
+        raise ValueError(f'Unknown sink: {sink}. Choose from {", ".join(SINKS)}')
+    return SINKS[sink][1](path)
+
+def upsert_output(df, sink, path):
+    """Insert or replace rows in a sink that supports upserts."""
+    if sink not in UPSERTS:
+        raise ValueError(f'Sink {sink} does not support upserts. Choose from {", ".join(UPSERTS)}')
+    UPSERTS[sink](df, path)
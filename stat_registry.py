@@ -0,0 +1,132 @@
+import numpy as np
+
+# Metric declarations. Every metric is one of:
+#   for_against - a match column summed for the team (home column, away column)
+#   count       - matches meeting a condition: a result or a zero for_against value
+#   combine     - a weighted sum of other metrics
+#   ratio       - 100 * numerator / (denominator * per), 0 when the denominator is 0
+
+def for_against(home_col, away_col):
+    return {'kind': 'for_against', 'columns': (home_col, away_col)}
+
+def count(result=None, zero=None):
+    return {'kind': 'count', 'result': result, 'zero': zero}
+
+def combine(**weights):
+    return {'kind': 'combine', 'weights': weights}
+
+def ratio(numerator, denominator, per=1):
+    return {'kind': 'ratio', 'numerator': numerator, 'denominator': denominator, 'per': per}
+
+# Published statistics, in the order of analyze_football_data.calculate_team_stats
+REGISTRY = {
+    'Goals': for_against('FTHG', 'FTAG'),
+    'GoalsConceded': for_against('FTAG', 'FTHG'),
+    'GoalDiff': combine(Goals=1, GoalsConceded=-1),
+    'Wins': count(result='W'),
+    'Draws': count(result='D'),
+    'Losses': count(result='L'),
+    'Points': combine(Wins=3, Draws=1),
+    'Shots': for_against('HS', 'AS'),
+    'ShotsOnTarget': for_against('HST', 'AST'),
+    'ShotConversion': ratio('Goals', 'Shots'),
+    'ShotAccuracy': ratio('ShotsOnTarget', 'Shots'),
+    'Corners': for_against('HC', 'AC'),
+    'Fouls': for_against('HF', 'AF'),
+    'YellowCards': for_against('HY', 'AY'),
+    'RedCards': for_against('HR', 'AR'),
+    'Form': ratio('Points', 'Played', per=3),
+    'CleanSheets': count(zero='GoalsConceded'),
+    'FailedToScore': count(zero='Goals'),
+}
+
+# FTR value for a win, draw and loss of the home and the away team
+RESULT_CODES = {
+    'W': ('H', 'A'),
+    'D': ('D', 'D'),
+    'L': ('A', 'H'),
+}
+
+def compile_registry(registry=REGISTRY):
+    """Split a registry into the per-match base columns and the derived metrics.
+
+    Base columns (for_against, count and the implicit 'Played') are summed over
+    the rolling windows; derived metrics are evaluated from those sums in
+    dependency order, so every window needs a single pass over the data.
+    """
+    for_against_columns = {
+        name: spec['columns'] for name, spec in registry.items() if spec['kind'] == 'for_against'
+    }
+    counts = {name: spec for name, spec in registry.items() if spec['kind'] == 'count'}
+
+    derived = []
+    resolved = set(for_against_columns) | set(counts) | {'Played'}
+    pending = {name: spec for name, spec in registry.items() if name not in resolved}
+    while pending:
+        ready = [
+            name for name, spec in pending.items()
+            if set(_dependencies(spec)) <= resolved
+        ]
+        if not ready:
+            raise ValueError(f'Unresolvable metrics: {", ".join(pending)}')
+        for name in ready:
+            derived.append((name, pending.pop(name)))
+            resolved.add(name)
+
+    return {
+        'for_against': for_against_columns,
+        'counts': counts,
+        'base': list(for_against_columns) + list(counts) + ['Played'],
+        'derived': derived,
+        'names': list(registry),
+    }
+
+def _dependencies(spec):
+    if spec['kind'] == 'combine':
+        return list(spec['weights'])
+    return [spec['numerator'], spec['denominator']]
+
+def base_columns(df, compiled, is_home, masks=None):
+    """Per-match base values of one side, as {name: array}.
+
+    Condition masks are built once and shared through `masks` across metrics
+    and between the home and away sides.
+    """
+    masks = {} if masks is None else masks
+    side = 0 if is_home else 1
+
+    def equals(col, value):
+        key = (col, value)
+        if key not in masks:
+            masks[key] = (df[col] == value).to_numpy()
+        return masks[key]
+
+    values = {}
+    for name, columns in compiled['for_against'].items():
+        values[name] = df[columns[side]].fillna(0).to_numpy(dtype=np.float64)
+    for name, spec in compiled['counts'].items():
+        if spec['result'] is not None:
+            mask = equals('FTR', RESULT_CODES[spec['result']][side])
+        else:
+            mask = equals(compiled['for_against'][spec['zero']][side], 0)
+        values[name] = mask.astype(np.int64)
+    values['Played'] = np.ones(len(df), dtype=np.int64)
+    return values
+
+def evaluate(sums, compiled):
+    """Every registry metric from window sums of the base columns, as {name: array}."""
+    values = {name: sums[name] for name in compiled['base']}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for name, spec in compiled['derived']:
+            if spec['kind'] == 'combine':
+                total = 0
+                for metric, weight in spec['weights'].items():
+                    total = total + (values[metric] * weight if weight != 1 else values[metric])
+                values[name] = total
+            else:
+                numerator = values[spec['numerator']]
+                denominator = values[spec['denominator']]
+                if spec['per'] != 1:
+                    denominator = denominator * spec['per']
+                values[name] = np.where(denominator > 0, numerator / denominator * 100, 0)
+    return {name: np.asarray(values[name], dtype=np.float64) for name in compiled['names']}
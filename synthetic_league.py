@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+RAW_COLUMNS = [
+    'Incremental_ID', 'Div', 'Date', 'Time', 'HomeTeam', 'AwayTeam',
+    'FTHG', 'FTAG', 'FTR', 'HTHG', 'HTAG', 'HTR', 'HS', 'AS', 'HST', 'AST',
+    'HF', 'AF', 'HC', 'AC', 'HY', 'AY', 'HR', 'AR'
+]
+
+def round_robin(teams):
+    """Return a double round-robin schedule as a list of rounds of (home, away) pairs."""
+    teams = list(teams)
+    if len(teams) % 2:
+        teams.append(None)
+    n = len(teams)
+    rounds = []
+    for r in range(n - 1):
+        pairs = []
+        for i in range(n // 2):
+            home, away = teams[i], teams[n - 1 - i]
+            if home is not None and away is not None:
+                # Alternate venues so no team is always at home
+                pairs.append((home, away) if (r + i) % 2 == 0 else (away, home))
+        rounds.append(pairs)
+        teams = [teams[0], teams[-1]] + teams[1:-1]
+    return rounds + [[(away, home) for home, away in pairs] for pairs in rounds]
+
+def _result(home_goals, away_goals):
+    return np.where(home_goals > away_goals, 'H', np.where(home_goals < away_goals, 'A', 'D'))
+
+def generate_league(teams=20, seasons=1, divisions=1, seed=0, start='2000-08-05'):
+    """Generate a synthetic match table in the 'Raw Data' sheet layout.
+
+    Every division plays a double round-robin per season with one round per
+    week. Team strengths drive goals and shots, and the other stats follow
+    typical per-match distributions.
+    """
+    rng = np.random.default_rng(seed)
+    fixtures = []
+    for season in range(seasons):
+        season_start = pd.Timestamp(start) + pd.DateOffset(years=season)
+        for d in range(divisions):
+            div = f'D{d + 1}'
+            names = [f'{div} Team {i + 1:02d}' for i in range(teams)]
+            for week, pairs in enumerate(round_robin(names)):
+                date = season_start + pd.Timedelta(weeks=week)
+                for home, away in pairs:
+                    fixtures.append((date, d, div, home, away))
+
+    df = pd.DataFrame(fixtures, columns=['Date', 'DivOrder', 'Div', 'HomeTeam', 'AwayTeam'])
+    df = df.sort_values(['Date', 'DivOrder'], kind='mergesort').drop(columns='DivOrder')
+    df = df.reset_index(drop=True)
+    n = len(df)
+
+    all_teams = pd.unique(pd.concat([df['HomeTeam'], df['AwayTeam']]))
+    strength = dict(zip(all_teams, rng.normal(0, 0.25, len(all_teams))))
+    home_strength = df['HomeTeam'].map(strength).to_numpy()
+    away_strength = df['AwayTeam'].map(strength).to_numpy()
+
+    home_goals = rng.poisson(np.exp(0.35 + home_strength - away_strength))
+    away_goals = rng.poisson(np.exp(0.10 + away_strength - home_strength))
+    home_shots = home_goals + rng.poisson(np.exp(2.4 + home_strength - away_strength))
+    away_shots = away_goals + rng.poisson(np.exp(2.2 + away_strength - home_strength))
+    home_target = home_goals + rng.binomial(home_shots - home_goals, 0.3)
+    away_target = away_goals + rng.binomial(away_shots - away_goals, 0.3)
+    home_half = rng.binomial(home_goals, 0.45)
+    away_half = rng.binomial(away_goals, 0.45)
+
+    df.insert(0, 'Incremental_ID', np.arange(1, n + 1))
+    df['Time'] = rng.choice(['12:30', '15:00', '17:30', '20:00'], n)
+    df['FTHG'] = home_goals
+    df['FTAG'] = away_goals
+    df['FTR'] = _result(home_goals, away_goals)
+    df['HTHG'] = home_half
+    df['HTAG'] = away_half
+    df['HTR'] = _result(home_half, away_half)
+    df['HS'] = home_shots
+    df['AS'] = away_shots
+    df['HST'] = home_target
+    df['AST'] = away_target
+    df['HF'] = rng.poisson(11, n)
+    df['AF'] = rng.poisson(11.5, n)
+    df['HC'] = rng.poisson(5.5, n)
+    df['AC'] = rng.poisson(4.5, n)
+    df['HY'] = rng.poisson(1.6, n)
+    df['AY'] = rng.poisson(1.9, n)
+    df['HR'] = rng.poisson(0.06, n)
+    df['AR'] = rng.poisson(0.08, n)
+    return df[RAW_COLUMNS]
+
+def write_workbook(df, path, sheet_name='Raw Data'):
+    """Write a generated match table as a workbook the processors can read."""
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        df.to_excel(writer, sheet_name=sheet_name, index=False)
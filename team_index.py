@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from rolling_engine import WINDOWS
+
+# Rolling stats summarised per team and window for the Team Analysis page
+SUMMARY_STATS = ['Goals', 'Wins', 'Form', 'CleanSheets', 'YellowCards', 'RedCards']
+
+def build_team_index(processed_data, windows=WINDOWS, stats=SUMMARY_STATS):
+    """Index the processed matches by team.
+
+    Returns {'rows': {team: row positions}, 'summaries': {team: {window:
+    {'Home_<stat>': mean, 'Away_<stat>': mean}}}} where the means are taken
+    over every match the team played, as on the Team Analysis page.
+    """
+    n = len(processed_data)
+    pairs = pd.DataFrame({
+        'Team': np.concatenate([
+            processed_data['HomeTeam'].to_numpy(object),
+            processed_data['AwayTeam'].to_numpy(object),
+        ]),
+        'Row': np.concatenate([np.arange(n), np.arange(n)]),
+    }).drop_duplicates().sort_values(['Team', 'Row'], kind='mergesort')
+
+    rows = {team: group.to_numpy() for team, group in pairs.groupby('Team')['Row']}
+
+    columns = [
+        f'{side}_{stat}_L{window}'
+        for window in windows for side in ['Home', 'Away'] for stat in stats
+    ]
+    columns = [col for col in columns if col in processed_data]
+    values = processed_data[columns].iloc[pairs['Row'].to_numpy()]
+    means = values.groupby(pairs['Team'].to_numpy()).mean()
+
+    summaries = {}
+    for team, team_means in means.iterrows():
+        summaries[team] = {
+            window: {
+                col[:-len(f'_L{window}')]: team_means[col]
+                for col in columns if col.endswith(f'_L{window}')
+            }
+            for window in windows
+        }
+    return {'rows': rows, 'summaries': summaries}